@@ -0,0 +1,38 @@
+import hashlib
+
+from django.core.cache import cache
+from rest_framework.authentication import TokenAuthentication
+
+from api.constants import (
+    AUTH_TOKEN_CACHE,
+    AUTH_TOKEN_CACHE_TIMEOUT,
+    AUTH_USER_DEFERRED_FIELDS
+)
+
+
+def get_token_cache_key(key):
+    return f'{AUTH_TOKEN_CACHE}:{hashlib.sha256(key.encode()).hexdigest()}'
+
+
+def forget_tokens(*keys):
+    """Сброс закешированных токенов при выходе или изменении пользователя."""
+    cache.delete_many([get_token_cache_key(key) for key in keys])
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """Аутентификация по токену с кешированием токена и пользователя.
+
+    Счетчики пользователя меняют другие запросы через F(), поэтому в
+    кеш пользователь попадает с отложенными счетчиками: они читаются из
+    базы при обращении, а save() без update_fields их не перезаписывает.
+    """
+
+    def authenticate_credentials(self, key):
+        cache_key = get_token_cache_key(key)
+        token = cache.get(cache_key)
+        if token is None:
+            user, token = super().authenticate_credentials(key)
+            for field in AUTH_USER_DEFERRED_FIELDS:
+                user.__dict__.pop(field, None)
+            cache.set(cache_key, token, AUTH_TOKEN_CACHE_TIMEOUT)
+        return token.user, token
@@ -0,0 +1,82 @@
+import hashlib
+import json
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db import connection
+from django.utils.cache import quote_etag
+
+from api.constants import (
+    COUNT_CACHE_TIMEOUT,
+    PAYLOAD_CACHE_TIMEOUT,
+    VERSION_CACHE_TIMEOUT
+)
+
+_local_payloads = {}
+
+
+def get_version(name):
+    """Текущая версия закешированных данных."""
+    key = f'version:{name}'
+    version = cache.get(key)
+    if version is None:
+        version = uuid4().hex
+        if not cache.add(key, version, VERSION_CACHE_TIMEOUT):
+            version = cache.get(key, version)
+    return version
+
+
+def bump_version(name):
+    """Сброс закешированных данных сменой версии."""
+    cache.set(f'version:{name}', uuid4().hex, VERSION_CACHE_TIMEOUT)
+
+
+def get_etag(data):
+    """Сильный ETag по содержимому ответа."""
+    content = json.dumps(data, ensure_ascii=False, sort_keys=True)
+    return quote_etag(hashlib.md5(content.encode()).hexdigest())
+
+
+def get_cached_payload(name, build):
+    """Сериализованные данные из памяти процесса или общего кеша.
+
+    Данные в памяти процесса сверяются с версией в общем кеше, поэтому
+    изменение справочника в одном процессе видно всем остальным.
+    """
+    version = get_version(name)
+    local = _local_payloads.get(name)
+    if local is not None and local[0] == version:
+        return local[1]
+    key = f'payload:{name}:{version}'
+    payload = cache.get(key)
+    if payload is None:
+        data = [dict(item) for item in build()]
+        payload = (data, get_etag(data))
+        cache.set(key, payload, PAYLOAD_CACHE_TIMEOUT)
+    _local_payloads[name] = (version, payload)
+    return payload
+
+
+def get_cached_count(key, versions, count):
+    """Количество объектов из кеша с учетом версий данных."""
+    key = ':'.join(
+        ('count', key, *(get_version(name) for name in versions))
+    )
+    value = cache.get(key)
+    if value is None:
+        value = count()
+        cache.set(key, value, COUNT_CACHE_TIMEOUT)
+    return value
+
+
+def get_estimated_count(model):
+    """Оценка количества строк таблицы по статистике Postgres."""
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT reltuples::bigint FROM pg_class WHERE relname = %s',
+            (model._meta.db_table,)
+        )
+        row = cursor.fetchone()
+    return row[0] if row else None
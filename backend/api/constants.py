@@ -0,0 +1,44 @@
+"""Константы приложения api."""
+
+SHOPPING_LIST_CHUNK_SIZE = 2000
+SHOPPING_LIST_TITLE = 'Список покупок:'
+SHOPPING_LIST_CSV_HEADER = ('Ингредиент', 'Количество', 'Единица измерения')
+PDF_FONT_NAME = 'ShoppingListFont'
+PDF_FALLBACK_FONT_NAME = 'Helvetica'
+PDF_FONT_SIZE = 12
+PDF_LINE_HEIGHT = 18
+PDF_MARGIN = 50
+TAGS_CACHE = 'tags'
+INGREDIENTS_CACHE = 'ingredients'
+REFERENCE_CACHE_MAX_AGE = 60
+RECIPES_CACHE = 'recipes'
+RECIPE_CACHE = 'recipe'
+USERS_CACHE = 'users'
+RESPONSE_CACHE = 'responses'
+FAVOURITES_CACHE = 'favourites'
+SHOPPING_CART_CACHE = 'shopping_cart'
+SUBSCRIPTIONS_CACHE = 'subscriptions'
+COUNT_CACHE_TIMEOUT = 60
+VERSION_CACHE_TIMEOUT = 60 * 60 * 24
+PAYLOAD_CACHE_TIMEOUT = 60 * 60 * 24
+COUNT_CACHE_IGNORED_PARAMS = (
+    'page', 'limit', 'offset', 'cursor', 'format', 'recipes_limit'
+)
+ESTIMATED_COUNT_THRESHOLD = 100000
+IMAGE_DIRECTORIES = ('recipes/images/', 'users/')
+IMAGE_RENDITIONS_DIRECTORY = 'renditions'
+IMAGE_RENDITIONS = {
+    'thumbnail': (160, 160),
+    'card': (480, 480),
+    'full': (1280, 1280),
+}
+IMAGE_RENDITION_FORMATS = {'webp': 'WEBP', 'jpeg': 'JPEG'}
+IMAGE_RENDITION_QUALITY = 80
+IMAGE_RENDITION_BACKGROUND = (255, 255, 255)
+UPLOAD_JSON_FIELD = 'data'
+AUTH_TOKEN_CACHE = 'auth_token'
+AUTH_TOKEN_CACHE_TIMEOUT = 60
+AUTH_USER_DEFERRED_FIELDS = ('recipes_count', 'subscribers_count')
+METRICS_PREFIX = 'foodgram'
+SLOW_REQUEST_SQL_LIMIT = 5
+SLOW_REQUEST_SQL_LENGTH = 300
@@ -1,7 +1,7 @@
 from django_filters import rest_framework as rest_framework_filter
-from django_filters.rest_framework import CharFilter, FilterSet
 
-from food.models import Recipe, Ingredients, Tag
+from api.search import search_recipes
+from food.models import Recipe, Tag
 
 
 class RecipeFilter(rest_framework_filter.FilterSet):
@@ -16,25 +16,27 @@ class RecipeFilter(rest_framework_filter.FilterSet):
     is_in_shopping_cart = rest_framework_filter.BooleanFilter(
         method='filter_is_in_shopping_cart'
     )
+    search = rest_framework_filter.CharFilter(method='filter_search')
 
     class Meta:
         model = Recipe
-        fields = ('author', 'tags', 'is_favorited', 'is_in_shopping_cart')
+        fields = (
+            'author',
+            'tags',
+            'is_favorited',
+            'is_in_shopping_cart',
+            'search',
+        )
 
     def filter_is_favorited(self, queryset, name, value):
         if self.request.user.is_authenticated and value:
-            return queryset.filter(favourites__user=self.request.user)
+            return queryset.filter(is_favorited=True)
         return queryset
 
     def filter_is_in_shopping_cart(self, queryset, name, value):
         if self.request.user.is_authenticated and value:
-            return queryset.filter(shoppingcart__user=self.request.user)
+            return queryset.filter(is_in_shopping_cart=True)
         return queryset
 
-
-class IngredientFilter(FilterSet):
-    name = CharFilter(lookup_expr='startswith',)
-
-    class Meta:
-        model = Ingredients
-        fields = ('name',)
+    def filter_search(self, queryset, name, value):
+        return search_recipes(queryset, value)
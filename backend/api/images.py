@@ -0,0 +1,116 @@
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.db import transaction
+from PIL import Image, ImageOps
+
+from api.constants import (
+    IMAGE_RENDITION_BACKGROUND,
+    IMAGE_RENDITION_FORMATS,
+    IMAGE_RENDITION_QUALITY,
+    IMAGE_RENDITIONS,
+    IMAGE_RENDITIONS_DIRECTORY,
+)
+
+logger = logging.getLogger(__name__)
+executor = None
+
+
+def get_rendition_prefix(name):
+    root = os.path.splitext(name)[0]
+    return f'{IMAGE_RENDITIONS_DIRECTORY}/{root}_'
+
+
+def get_rendition_name(name, size, extension):
+    """Путь уменьшенной копии картинки в хранилище."""
+    return f'{get_rendition_prefix(name)}{size}.{extension}'
+
+
+def get_renditions(name, build_url=None):
+    """Ссылки на уменьшенные копии картинки по размерам и форматам."""
+    build_url = build_url or str
+    if isinstance(default_storage, FileSystemStorage):
+        # Ссылки файловой системы различаются только окончанием, поэтому
+        # хватает одного вызова url() на картинку.
+        prefix = build_url(default_storage.url(get_rendition_prefix(name)))
+        return {
+            size: {
+                extension: f'{prefix}{size}.{extension}'
+                for extension in IMAGE_RENDITION_FORMATS
+            }
+            for size in IMAGE_RENDITIONS
+        }
+    return {
+        size: {
+            extension: build_url(
+                default_storage.url(get_rendition_name(name, size, extension))
+            )
+            for extension in IMAGE_RENDITION_FORMATS
+        }
+        for size in IMAGE_RENDITIONS
+    }
+
+
+def flatten(image):
+    """Картинка без прозрачности на белом фоне."""
+    if image.mode in ('RGBA', 'LA', 'P'):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, IMAGE_RENDITION_BACKGROUND)
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def render_image(name, force=False):
+    """Создание уменьшенных копий картинки, если их ещё нет."""
+    names = {
+        (size, extension): get_rendition_name(name, size, extension)
+        for size in IMAGE_RENDITIONS
+        for extension in IMAGE_RENDITION_FORMATS
+    }
+    if not force and all(map(default_storage.exists, names.values())):
+        return False
+    with default_storage.open(name) as file:
+        source = flatten(ImageOps.exif_transpose(Image.open(file)))
+    for (size, extension), rendition_name in names.items():
+        image = source.copy()
+        image.thumbnail(IMAGE_RENDITIONS[size], Image.LANCZOS)
+        buffer = BytesIO()
+        image.save(
+            buffer,
+            IMAGE_RENDITION_FORMATS[extension],
+            quality=IMAGE_RENDITION_QUALITY
+        )
+        default_storage.delete(rendition_name)
+        default_storage.save(rendition_name, ContentFile(buffer.getvalue()))
+    return True
+
+
+def render_image_safely(name):
+    try:
+        return render_image(name)
+    except Exception:
+        logger.exception('Не удалось обработать картинку %s', name)
+        return False
+
+
+def get_executor():
+    global executor
+    if executor is None:
+        executor = ThreadPoolExecutor(
+            max_workers=settings.IMAGE_PROCESSING_WORKERS,
+            thread_name_prefix='images'
+        )
+    return executor
+
+
+def schedule_renditions(name):
+    """Обработка картинки в фоновом потоке после фиксации транзакции."""
+    transaction.on_commit(
+        lambda: get_executor().submit(render_image_safely, name)
+    )
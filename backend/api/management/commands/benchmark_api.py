@@ -0,0 +1,166 @@
+import json
+import platform
+import statistics
+import tracemalloc
+from time import perf_counter
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from api.metrics import QueryRecorder
+from food.models import Recipe, ShoppingListItem, Tag, User
+from users.models import Subscribe
+
+
+class Command(BaseCommand):
+    help = (
+        'Замер времени, количества SQL запросов и памяти основных '
+        'эндпоинтов через тестовый клиент Django с записью в JSON. '
+        'Данные готовит seed_benchmark_data.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            type=str,
+            default='benchmark.json',
+            help='Файл для результатов'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=30,
+            help='Количество замеров каждого сценария'
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=3,
+            help='Количество запросов перед замерами'
+        )
+
+    def get_scenarios(self):
+        user = User.objects.filter(
+            pk__in=Subscribe.objects.values('user')
+        ).filter(
+            pk__in=ShoppingListItem.objects.values('user')
+        ).order_by('pk').first()
+        recipe = Recipe.objects.order_by('-pub_date', '-id').first()
+        tag = Tag.objects.order_by('pk').first()
+        if user is None or recipe is None or tag is None:
+            raise CommandError(
+                'Нет данных, сначала выполните seed_benchmark_data'
+            )
+        token, _ = Token.objects.get_or_create(user=user)
+        auth = {'HTTP_AUTHORIZATION': f'Token {token.key}'}
+        return (
+            ('recipes_list_anonymous', '/api/recipes/', {}),
+            ('recipes_list', '/api/recipes/', auth),
+            ('recipes_list_page_10', '/api/recipes/?page=10', auth),
+            ('recipes_list_tag', f'/api/recipes/?tags={tag.slug}', auth),
+            (
+                'recipes_list_author',
+                f'/api/recipes/?author={recipe.author_id}',
+                auth
+            ),
+            ('recipes_list_favorited', '/api/recipes/?is_favorited=1', auth),
+            ('recipes_list_search', '/api/recipes/?search=рецепт', auth),
+            ('recipe_detail', f'/api/recipes/{recipe.pk}/', auth),
+            (
+                'subscriptions',
+                '/api/users/subscriptions/?recipes_limit=3',
+                auth
+            ),
+            (
+                'shopping_list_download',
+                '/api/recipes/download_shopping_cart/',
+                auth
+            ),
+            ('ingredients_search', '/api/ingredients/?name=мо', {}),
+            ('short_link_redirect', f'/s/{recipe.short_link}/', {}),
+        )
+
+    def request(self, client, url, headers):
+        response = client.get(url, **headers)
+        if response.streaming:
+            size = sum(len(chunk) for chunk in response.streaming_content)
+        else:
+            size = len(response.content)
+        return response.status_code, size
+
+    def measure(self, client, url, headers, repeat, warmup):
+        for _ in range(warmup):
+            self.request(client, url, headers)
+        timings = []
+        for _ in range(repeat):
+            start = perf_counter()
+            self.request(client, url, headers)
+            timings.append((perf_counter() - start) * 1000)
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            status, size = self.request(client, url, headers)
+        tracemalloc.start()
+        self.request(client, url, headers)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        timings.sort()
+        return {
+            'status': status,
+            'response_bytes': size,
+            'queries': recorder.count,
+            'db_ms': round(recorder.duration * 1000, 3),
+            'latency_ms': {
+                'min': round(timings[0], 3),
+                'median': round(statistics.median(timings), 3),
+                'p95': round(timings[int(len(timings) * 0.95) - 1], 3),
+                'mean': round(statistics.mean(timings), 3),
+                'max': round(timings[-1], 3),
+            },
+            'peak_memory_kb': round(peak / 1024, 1),
+        }
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1:
+            raise CommandError('--repeat должен быть больше нуля')
+        client = Client()
+        results = {}
+        with override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+            METRICS_SAMPLE_RATE=0
+        ):
+            for name, url, headers in self.get_scenarios():
+                results[name] = self.measure(
+                    client, url, headers,
+                    options['repeat'], options['warmup']
+                )
+                latency = results[name]['latency_ms']
+                self.stdout.write(
+                    f'{name}: {results[name]["status"]}, '
+                    f'медиана {latency["median"]:.1f} мс, '
+                    f'p95 {latency["p95"]:.1f} мс, '
+                    f'SQL {results[name]["queries"]}, '
+                    f'память {results[name]["peak_memory_kb"]:.0f} КБ'
+                )
+        report = {
+            'created': timezone.now().isoformat(),
+            'environment': {
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'recipes': Recipe.objects.count(),
+                'users': User.objects.count(),
+            },
+            'repeat': options['repeat'],
+            'scenarios': results,
+        }
+        with open(options['output'], 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+        self.stdout.write(self.style.SUCCESS(
+            f'Результаты записаны в {options["output"]}'
+        ))
@@ -0,0 +1,103 @@
+import csv
+from itertools import chain, cycle, islice
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.search import IngredientSearchIndex
+from api.serializers import IngredientsSerializer
+from food.models import Ingredients
+
+QUERIES = ('мо', 'сол', 'кар', 'я', 'ежевика')
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнение поиска ингредиентов по индексу в памяти и через ORM. '
+        'Справочник заменяется тестовыми ингредиентами в транзакции, '
+        'которая затем откатывается.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            type=str,
+            default='data/',
+            help='Путь к папке с ingredients.csv'
+        )
+        parser.add_argument(
+            '--sizes',
+            type=int,
+            nargs='+',
+            default=(2000, 200000),
+            help='Количество ингредиентов в справочнике'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=20,
+            help='Количество повторов каждого запроса'
+        )
+
+    def orm_search(self, query):
+        """Совпадения по началу названия, затем по вхождению, как у индекса."""
+        prefix = Ingredients.objects.filter(name__istartswith=query)
+        substring = Ingredients.objects.filter(
+            name__icontains=query
+        ).exclude(name__istartswith=query)
+        return IngredientsSerializer(
+            chain(prefix.order_by('name'), substring.order_by('name')),
+            many=True
+        ).data
+
+    def measure(self, search, repeat):
+        start = perf_counter()
+        for _ in range(repeat):
+            for query in QUERIES:
+                search(query)
+        return (perf_counter() - start) * 1000 / (repeat * len(QUERIES))
+
+    def handle(self, *args, **options):
+        file_path = options['path'] + 'ingredients.csv'
+        with open(file_path, encoding='utf-8') as file:
+            names = list(csv.reader(file))
+        for size in options['sizes']:
+            with transaction.atomic():
+                Ingredients.objects.all().delete()
+                Ingredients.objects.bulk_create(
+                    (
+                        Ingredients(
+                            name=f'{name} {number}',
+                            measurement_unit=measurement_unit
+                        )
+                        for number, (name, measurement_unit) in enumerate(
+                            islice(cycle(names), size)
+                        )
+                    ),
+                    batch_size=5000
+                )
+                items = list(Ingredients.objects.values(
+                    'id', 'name', 'measurement_unit'
+                ))
+                start = perf_counter()
+                index = IngredientSearchIndex(items)
+                build = (perf_counter() - start) * 1000
+                index_time = self.measure(index.search, options['repeat'])
+                orm_time = self.measure(self.orm_search, options['repeat'])
+                mismatched = [
+                    query for query in QUERIES
+                    if {item['id'] for item in index.search(query)}
+                    != {item['id'] for item in self.orm_search(query)}
+                ]
+                transaction.set_rollback(True)
+            self.stdout.write(
+                f'{len(items)} ингредиентов: построение индекса '
+                f'{build:.1f} мс, индекс {index_time:.2f} мс/запрос, '
+                f'ORM {orm_time:.2f} мс/запрос'
+            )
+            if mismatched:
+                self.stdout.write(self.style.WARNING(
+                    'Результаты индекса и ORM различаются для запросов: '
+                    + ', '.join(mismatched)
+                ))
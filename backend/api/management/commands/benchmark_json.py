@@ -0,0 +1,74 @@
+import json
+from io import BytesIO
+from time import perf_counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.test.utils import override_settings
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer, orjson
+from food.models import Ingredients, Recipe
+
+BENCHMARK_URLS = ('/api/ingredients/', '/api/recipes/?limit=100')
+
+
+class Command(BaseCommand):
+    help = (
+        'Замер скорости JSONRenderer и JSONParser против FastJSONRenderer '
+        'и FastJSONParser на больших ответах API'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=50,
+            help='Количество повторов при замере скорости'
+        )
+
+    def measure(self, function, repeat):
+        start = perf_counter()
+        for _ in range(repeat):
+            result = function()
+        return (perf_counter() - start) / repeat, result
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write(self.style.WARNING(
+                'orjson не установлен, используется стандартный json'
+            ))
+        if not Recipe.objects.exists() or not Ingredients.objects.exists():
+            raise CommandError(
+                'Нет данных, сначала выполните seed_benchmark_data'
+            )
+        with override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+            METRICS_SAMPLE_RATE=0
+        ):
+            client = Client()
+            payloads = {url: client.get(url).data for url in BENCHMARK_URLS}
+        for url, data in payloads.items():
+            results = {}
+            for name, renderer, parser in (
+                ('json', JSONRenderer(), JSONParser()),
+                ('orjson', FastJSONRenderer(), FastJSONParser()),
+            ):
+                render_time, content = self.measure(
+                    lambda: renderer.render(data), options['repeat']
+                )
+                parse_time, _ = self.measure(
+                    lambda: parser.parse(BytesIO(content)), options['repeat']
+                )
+                results[name] = (render_time, parse_time, len(content))
+            self.stdout.write(f'{url}: ' + json.dumps({
+                name: {
+                    'render_ms': round(render_time * 1000, 3),
+                    'parse_ms': round(parse_time * 1000, 3),
+                    'render_mb_s': round(size / render_time / 2 ** 20, 1),
+                }
+                for name, (render_time, parse_time, size) in results.items()
+            }))
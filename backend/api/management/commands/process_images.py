@@ -0,0 +1,58 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from time import perf_counter
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+from api.constants import IMAGE_DIRECTORIES
+from api.images import logger, render_image
+
+
+class Command(BaseCommand):
+    help = 'Создание уменьшенных копий для уже загруженных картинок'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Пересоздать копии, даже если они уже есть'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=settings.IMAGE_PROCESSING_WORKERS,
+            help='Количество потоков обработки'
+        )
+
+    def get_names(self):
+        for directory in IMAGE_DIRECTORIES:
+            if not default_storage.exists(directory):
+                continue
+            for name in default_storage.listdir(directory)[1]:
+                yield directory + name
+
+    def process(self, name, force):
+        try:
+            return 'processed' if render_image(name, force) else 'skipped'
+        except Exception:
+            logger.exception('Не удалось обработать картинку %s', name)
+            return 'failed'
+
+    def handle(self, *args, **options):
+        counts = {'processed': 0, 'skipped': 0, 'failed': 0}
+        start = perf_counter()
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            for result in pool.map(
+                partial(self.process, force=options['force']),
+                self.get_names()
+            ):
+                counts[result] += 1
+        self.stdout.write(self.style.SUCCESS(
+            'Обработано {processed}, пропущено {skipped}, '
+            'с ошибкой {failed} за {elapsed:.1f} с'.format(
+                elapsed=perf_counter() - start,
+                **counts
+            )
+        ))
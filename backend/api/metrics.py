@@ -0,0 +1,196 @@
+import logging
+import random
+from collections import defaultdict
+from threading import Lock
+from time import perf_counter
+
+from django.conf import settings
+from django.db import connection
+from django.http import Http404, HttpResponse
+
+from api.constants import (
+    METRICS_PREFIX,
+    SLOW_REQUEST_SQL_LENGTH,
+    SLOW_REQUEST_SQL_LIMIT,
+)
+
+logger = logging.getLogger(__name__)
+
+METRICS = (
+    ('requests_total', 'counter', 'Количество запросов'),
+    ('request_duration_seconds', 'summary', 'Время обработки запроса'),
+    ('db_queries_total', 'counter', 'Количество SQL запросов'),
+    ('db_duration_seconds_total', 'counter', 'Время выполнения SQL'),
+    (
+        'app_duration_seconds_total',
+        'counter',
+        'Время представления без SQL: сериализация и код Python'
+    ),
+    (
+        'render_duration_seconds_total',
+        'counter',
+        'Время рендеринга ответа'
+    ),
+    ('response_bytes_total', 'counter', 'Размер ответов'),
+)
+
+
+class QueryRecorder:
+    """Счётчик SQL запросов для connection.execute_wrapper."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0
+        self.statements = defaultdict(lambda: [0, 0])
+
+    def __call__(self, execute, sql, params, many, context):
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = perf_counter() - start
+            self.count += 1
+            self.duration += duration
+            statement = self.statements[sql]
+            statement[0] += 1
+            statement[1] += duration
+
+
+class MetricsRegistry:
+    """Сводка по представлениям в памяти процесса."""
+
+    def __init__(self):
+        self.lock = Lock()
+        self.values = defaultdict(lambda: defaultdict(float))
+
+    def record(self, labels, **values):
+        with self.lock:
+            series = self.values[labels]
+            series['requests_total'] += 1
+            for name, value in values.items():
+                series[name] += value
+
+    def render(self):
+        lines = []
+        with self.lock:
+            values = {
+                labels: dict(series)
+                for labels, series in self.values.items()
+            }
+        for name, metric_type, description in METRICS:
+            full_name = f'{METRICS_PREFIX}_{name}'
+            lines.append(f'# HELP {full_name} {description}')
+            lines.append(f'# TYPE {full_name} {metric_type}')
+            for (view, method, status), series in sorted(values.items()):
+                labels = (
+                    f'view="{view}",method="{method}",status="{status}"'
+                )
+                if metric_type == 'summary':
+                    lines.append(
+                        f'{full_name}_sum{{{labels}}} {series[name]:.6f}'
+                    )
+                    lines.append(
+                        f'{full_name}_count{{{labels}}} '
+                        f'{series["requests_total"]:.0f}'
+                    )
+                else:
+                    lines.append(f'{full_name}{{{labels}}} {series[name]:g}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+class MetricsMiddleware:
+    """Число SQL запросов и время обработки для части запросов.
+
+    Доля запросов задаётся METRICS_SAMPLE_RATE. Для них добавляется
+    заголовок Server-Timing, значения копятся в registry, а запросы
+    дольше SLOW_REQUEST_THRESHOLD миллисекунд пишутся в лог вместе с
+    самыми долгими и повторяющимися SQL.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if random.random() >= settings.METRICS_SAMPLE_RATE:
+            return self.get_response(request)
+        recorder = QueryRecorder()
+        request._metrics = {'start': perf_counter()}
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+        self.finish(request, response, recorder)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if hasattr(request, '_metrics'):
+            request._metrics['view'] = perf_counter()
+
+    def process_template_response(self, request, response):
+        if hasattr(request, '_metrics'):
+            request._metrics['render'] = perf_counter()
+        return response
+
+    def finish(self, request, response, recorder):
+        end = perf_counter()
+        timings = request._metrics
+        view_start = timings.get('view', timings['start'])
+        render_start = timings.get('render', end)
+        total = end - timings['start']
+        render = end - render_start
+        app = max(render_start - view_start - recorder.duration, 0)
+        response['Server-Timing'] = ', '.join((
+            f'db;dur={recorder.duration * 1000:.1f};'
+            f'desc="{recorder.count} queries"',
+            f'app;dur={app * 1000:.1f}',
+            f'render;dur={render * 1000:.1f}',
+            f'total;dur={total * 1000:.1f}',
+        ))
+        match = request.resolver_match
+        view = match.view_name if match else 'unresolved'
+        if view == 'metrics':
+            return
+        registry.record(
+            (view, request.method, response.status_code),
+            request_duration_seconds=total,
+            db_queries_total=recorder.count,
+            db_duration_seconds_total=recorder.duration,
+            app_duration_seconds_total=app,
+            render_duration_seconds_total=render,
+            response_bytes_total=(
+                0 if response.streaming else len(response.content)
+            ),
+        )
+        if total * 1000 >= settings.SLOW_REQUEST_THRESHOLD:
+            self.log_slow_request(request, total, recorder)
+
+    def log_slow_request(self, request, total, recorder):
+        statements = sorted(
+            recorder.statements.items(),
+            key=lambda item: item[1][1],
+            reverse=True
+        )[:SLOW_REQUEST_SQL_LIMIT]
+        logger.warning(
+            'Медленный запрос %s %s: %.0f мс, SQL запросов %d (%.0f мс)\n%s',
+            request.method,
+            request.get_full_path(),
+            total * 1000,
+            recorder.count,
+            recorder.duration * 1000,
+            '\n'.join(
+                f'  {count}x {duration * 1000:.1f} мс '
+                f'{sql[:SLOW_REQUEST_SQL_LENGTH]}'
+                for sql, (count, duration) in statements
+            )
+        )
+
+
+def metrics_view(request):
+    """Метрики в текстовом формате Prometheus для адресов INTERNAL_IPS."""
+    if request.META.get('REMOTE_ADDR') not in settings.INTERNAL_IPS:
+        raise Http404
+    return HttpResponse(
+        registry.render(),
+        content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
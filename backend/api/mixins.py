@@ -0,0 +1,101 @@
+from hashlib import md5
+
+from django.core.cache import caches
+from django.utils.cache import get_conditional_response, patch_cache_control
+from rest_framework.response import Response
+
+from api.cache import get_cached_payload, get_etag, get_version
+from api.constants import REFERENCE_CACHE_MAX_AGE, RESPONSE_CACHE
+
+
+class CachedReferenceMixin:
+    """Справочник из кеша с заголовками ETag и Cache-Control.
+
+    Запросы с параметрами фильтрации обрабатываются без кеша.
+    """
+
+    cache_name = None
+
+    def get_cached_payload(self):
+        return get_cached_payload(
+            self.cache_name,
+            lambda: self.get_serializer(
+                self.get_queryset(),
+                many=True
+            ).data
+        )
+
+    def get_cached_response(self, data, etag):
+        response = get_conditional_response(self.request, etag=etag)
+        if response is None:
+            response = Response(data)
+        response['ETag'] = etag
+        patch_cache_control(
+            response,
+            public=True,
+            max_age=REFERENCE_CACHE_MAX_AGE
+        )
+        return response
+
+    def list(self, request, *args, **kwargs):
+        if set(request.query_params) - {'format'}:
+            return super().list(request, *args, **kwargs)
+        return self.get_cached_response(*self.get_cached_payload())
+
+    def retrieve(self, request, *args, **kwargs):
+        data, _ = self.get_cached_payload()
+        lookup = str(kwargs[self.lookup_url_kwarg or self.lookup_field])
+        for item in data:
+            if str(item['id']) == lookup:
+                return self.get_cached_response(item, get_etag(item))
+        return super().retrieve(request, *args, **kwargs)
+
+
+class AnonymousResponseCacheMixin:
+    """Кеширование ответов list и retrieve для анонимных пользователей.
+
+    Ключ строится по адресу запроса со схемой и хостом, так как ответы
+    содержат абсолютные ссылки, по отсортированным параметрам запроса и
+    версиям данных из get_response_cache_versions.
+    """
+
+    def get_response_cache_versions(self):
+        return ()
+
+    def get_anonymous_response(self, build):
+        url = self.request.build_absolute_uri(self.request.path)
+        query = sorted(
+            (name, sorted(self.request.query_params.getlist(name)))
+            for name in self.request.query_params
+        )
+        key = ':'.join((
+            'response',
+            md5(f'{url}:{query}'.encode()).hexdigest(),
+            *(get_version(name) for name in self.get_response_cache_versions())
+        ))
+        cache = caches[RESPONSE_CACHE]
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = build()
+        if response.status_code == 200:
+            cache.set(key, response.data)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return super().list(request, *args, **kwargs)
+        return self.get_anonymous_response(
+            lambda: super(AnonymousResponseCacheMixin, self).list(
+                request, *args, **kwargs
+            )
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return super().retrieve(request, *args, **kwargs)
+        return self.get_anonymous_response(
+            lambda: super(AnonymousResponseCacheMixin, self).retrieve(
+                request, *args, **kwargs
+            )
+        )
@@ -1,6 +1,216 @@
-from rest_framework.pagination import PageNumberPagination
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
 
+from hashlib import md5
+
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    BasePagination,
+    LimitOffsetPagination,
+    PageNumberPagination
+)
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from api.cache import get_cached_count, get_estimated_count
+from api.constants import (
+    COUNT_CACHE_IGNORED_PARAMS,
+    ESTIMATED_COUNT_THRESHOLD,
+    FAVOURITES_CACHE,
+    RECIPES_CACHE,
+    SHOPPING_CART_CACHE,
+    SUBSCRIPTIONS_CACHE
+)
+
+
+class CachedCountPaginator(Paginator):
+    """Пагинатор, получающий количество объектов через функцию."""
+
+    def __init__(self, object_list, per_page, get_count, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.get_count = get_count
+
+    @cached_property
+    def count(self):
+        return self.get_count(self.object_list)
+
+
+class CachedCountMixin:
+    """Кеширование COUNT(*) по нормализованным параметрам запроса.
+
+    Кеш сбрасывается сменой версий общих данных и данных пользователя,
+    для списка без фильтров в Postgres берется оценка из статистики.
+    """
+
+    count_cache_versions = ()
+    count_cache_user_versions = ()
+    estimate_count = False
+
+    def get_count_cache_params(self):
+        return sorted(
+            (name, sorted(self.request.query_params.getlist(name)))
+            for name in self.request.query_params
+            if name not in COUNT_CACHE_IGNORED_PARAMS
+        )
+
+    def get_count(self, queryset):
+        params = self.get_count_cache_params()
+        if self.estimate_count and not params:
+            estimate = get_estimated_count(queryset.model)
+            if estimate is not None and estimate >= ESTIMATED_COUNT_THRESHOLD:
+                return estimate
+        user = self.request.user
+        versions = self.count_cache_versions
+        if user.is_authenticated:
+            versions += tuple(
+                f'{name}:{user.id}' for name in self.count_cache_user_versions
+            )
+        key = md5(
+            f'{self.request.path}:{user.id}:{params}'.encode()
+        ).hexdigest()
+        return get_cached_count(key, versions, queryset.count)
+
+
+class RecipesCountMixin(CachedCountMixin):
+    count_cache_versions = (RECIPES_CACHE,)
+    count_cache_user_versions = (FAVOURITES_CACHE, SHOPPING_CART_CACHE)
+    estimate_count = True
+
+
+class RecipesCursorPagination(RecipesCountMixin, BasePagination):
+    """Постраничный вывод рецептов по ключу (pub_date, id).
+
+    Следующая страница выбирается условием по дате публикации и id
+    последнего рецепта, поэтому время ответа не зависит от глубины.
+    """
+
+    cursor_query_param = 'cursor'
+    page_size = 6
+    page_size_query_param = 'limit'
+    max_page_size = 100
+    invalid_cursor_message = 'Неверный курсор.'
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            reverse, pub_date, pk = urlsafe_b64decode(
+                encoded.encode('ascii')
+            ).decode('ascii').split('|')
+            position = (parse_datetime(pub_date), int(pk))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if position[0] is None:
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse == '1'
+
+    def encode_cursor(self, recipe, reverse):
+        cursor = '|'.join((
+            '1' if reverse else '0',
+            recipe.pub_date.isoformat(),
+            str(recipe.pk),
+        ))
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            urlsafe_b64encode(cursor.encode('ascii')).decode('ascii')
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request)
+        self.count = self.get_count(queryset)
+        if position is None:
+            queryset = queryset.order_by('-pub_date', '-id')
+        elif reverse:
+            pub_date, pk = position
+            queryset = queryset.filter(
+                Q(pub_date__gt=pub_date) | Q(pub_date=pub_date, pk__gt=pk)
+            ).order_by('pub_date', 'id')
+        else:
+            pub_date, pk = position
+            queryset = queryset.filter(
+                Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, pk__lt=pk)
+            ).order_by('-pub_date', '-id')
+        results = list(queryset[:page_size + 1])
+        has_more = len(results) > page_size
+        results = results[:page_size]
+        if reverse:
+            results.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+        self.results = results
+        return results
+
+    def get_next_link(self):
+        if not self.has_next or not self.results:
+            return None
+        return self.encode_cursor(self.results[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.results:
+            return None
+        return self.encode_cursor(self.results[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('count', self.count),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data)
+        ]))
+
+
+class RecipesPagination(RecipesCountMixin, PageNumberPagination):
+    """Постраничный вывод рецептов.
+
+    С параметром cursor включается постраничный вывод по ключу.
+    """
 
-class RecipesPagination(PageNumberPagination):
     page_size = 6
     page_size_query_param = 'limit'
+    cursor_pagination_class = RecipesCursorPagination
+
+    def django_paginator_class(self, queryset, page_size):
+        return CachedCountPaginator(queryset, page_size, self.get_count)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.cursor_pagination = None
+        if self.cursor_pagination_class.cursor_query_param in (
+            request.query_params
+        ):
+            self.cursor_pagination = self.cursor_pagination_class()
+            return self.cursor_pagination.paginate_queryset(
+                queryset, request, view
+            )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_pagination is not None:
+            return self.cursor_pagination.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+class SubscriptionsPagination(CachedCountMixin, LimitOffsetPagination):
+    count_cache_user_versions = (SUBSCRIPTIONS_CACHE,)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        return super().paginate_queryset(queryset, request, view)
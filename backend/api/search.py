@@ -0,0 +1,130 @@
+import re
+from bisect import bisect_left
+
+from django.db import connection
+from django.db.models import Q
+
+from food.models import RecipeIngredients
+
+SEARCH_CONFIG = 'russian'
+
+_ingredient_index = None
+
+
+def normalize(value):
+    """Приведение строки к виду для поиска без учета регистра и «ё»."""
+    return value.casefold().replace('ё', 'е')
+
+
+class IngredientSearchIndex:
+    """Отсортированный индекс названий ингредиентов.
+
+    Начало строки ищется бинарным поиском, вхождения в середину названия
+    добавляются после совпадений по началу.
+    """
+
+    def __init__(self, items):
+        self.items = items
+        keys = sorted(
+            (normalize(item['name']), position)
+            for position, item in enumerate(items)
+        )
+        self.names = [name for name, _ in keys]
+        self.positions = [position for _, position in keys]
+
+    def search(self, query):
+        query = normalize(query)
+        if not query:
+            return self.items
+        start = bisect_left(self.names, query)
+        end = start
+        while end < len(self.names) and self.names[end].startswith(query):
+            end += 1
+        exact = []
+        prefix = []
+        for index in range(start, end):
+            if self.names[index] == query:
+                exact.append(self.positions[index])
+            else:
+                prefix.append(self.positions[index])
+        substring = [
+            self.positions[index]
+            for index, name in enumerate(self.names)
+            if (index < start or index >= end) and query in name
+        ]
+        return [
+            self.items[position] for position in exact + prefix + substring
+        ]
+
+
+def get_ingredient_index(items):
+    """Индекс для текущей версии справочника ингредиентов."""
+    global _ingredient_index
+    if _ingredient_index is None or _ingredient_index.items is not items:
+        _ingredient_index = IngredientSearchIndex(items)
+    return _ingredient_index
+
+
+def search_recipes_postgresql(queryset, query):
+    """Поиск рецептов в Postgres.
+
+    Слова ищутся по началу в документе поиска с названием, описанием и
+    ингредиентами, вхождение в название — по триграммному индексу. Оба
+    условия проверяются по индексам food_recipe.
+    """
+    terms = ' & '.join(
+        '{}:*'.format(term) for term in re.findall(r'\w+', query)
+    )
+    if not terms:
+        return queryset
+    pattern = '%{}%'.format(connection.ops.prep_for_like_query(query))
+    return queryset.extra(
+        select={'search_rank': (
+            'ts_rank(food_recipe.search_document, to_tsquery(%s, %s)) '
+            '+ similarity(food_recipe.name, %s)'
+        )},
+        select_params=(SEARCH_CONFIG, terms, query),
+        where=(
+            '(food_recipe.search_document @@ to_tsquery(%s, %s) '
+            'OR food_recipe.name ILIKE %s)',
+        ),
+        params=(SEARCH_CONFIG, terms, pattern),
+    ).order_by('-search_rank', '-pub_date')
+
+
+def search_recipes_sqlite(queryset, query):
+    """Поиск рецептов по таблице FTS5 в SQLite."""
+    terms = ' '.join(
+        '"{}"*'.format(term) for term in re.findall(r'\w+', query)
+    )
+    if not terms:
+        return queryset
+    # Соединение с таблицей FTS5, а не подзапрос ранга для каждой строки:
+    # MATCH выполняется один раз на весь запрос.
+    return queryset.extra(
+        select={'search_rank': 'food_recipe_search.rank'},
+        tables=('food_recipe_search',),
+        where=(
+            'food_recipe_search.rowid = food_recipe.id',
+            'food_recipe_search MATCH %s',
+        ),
+        params=(terms,),
+    ).order_by('search_rank', '-pub_date')
+
+
+def search_recipes(queryset, query):
+    """Поиск рецептов по названию, описанию и ингредиентам."""
+    query = query.strip()
+    if not query:
+        return queryset
+    if connection.vendor == 'postgresql':
+        return search_recipes_postgresql(queryset, query)
+    if connection.vendor == 'sqlite':
+        return search_recipes_sqlite(queryset, query)
+    return queryset.filter(
+        Q(name__icontains=query)
+        | Q(text__icontains=query)
+        | Q(pk__in=RecipeIngredients.objects.filter(
+            ingredients__name__icontains=query
+        ).values('recipe_id'))
+    )
@@ -1,9 +1,20 @@
-from drf_extra_fields.fields import Base64ImageField
+import os
+
+from drf_extra_fields.fields import Base64FieldMixin, Base64ImageField
+from django.core.files.uploadedfile import UploadedFile
 from django.db import transaction
 from djoser.serializers import UserSerializer
 from rest_framework import serializers
 from rest_framework.validators import UniqueTogetherValidator
 
+from api.images import get_renditions
+from api.services import (
+    change_shopping_list,
+    get_amounts_difference,
+    get_recipe_amounts,
+    get_recipes_limit,
+    get_shopping_cart_users
+)
 from food.constants import MAX_AMOUNT_VALUE, MIN_AMOUNT_VALUE
 from food.models import (
     Ingredients,
@@ -17,17 +28,48 @@ from food.models import (
 from users.models import Subscribe
 
 
+class ImageRenditionsField(serializers.ReadOnlyField):
+    """Ссылки на уменьшенные копии картинки."""
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        request = self.context.get('request')
+        return get_renditions(
+            value.name,
+            request.build_absolute_uri if request else None
+        )
+
+
+class ImageUploadField(Base64ImageField):
+    """Картинка строкой в Base64 или файлом из multipart запроса."""
+
+    def to_internal_value(self, data):
+        if isinstance(data, UploadedFile):
+            extension = os.path.splitext(data.name)[1].lower()
+            data.name = self.get_file_name(None) + extension
+            return super(Base64FieldMixin, self).to_internal_value(data)
+        return super().to_internal_value(data)
+
+
 class FoodgramUserSerializer(UserSerializer):
     """Сериализатор пользователя."""
 
     is_subscribed = serializers.SerializerMethodField()
-    avatar = Base64ImageField(required=False, allow_null=True)
+    avatar = ImageUploadField(required=False, allow_null=True)
+    avatar_renditions = ImageRenditionsField(source='avatar')
 
     class Meta(UserSerializer.Meta):
         model = User
-        fields = UserSerializer.Meta.fields + ('is_subscribed', 'avatar')
+        fields = UserSerializer.Meta.fields + (
+            'is_subscribed',
+            'avatar',
+            'avatar_renditions',
+        )
 
     def get_is_subscribed(self, obj):
+        if hasattr(obj, 'is_subscribed'):
+            return obj.is_subscribed
         request = self.context['request']
         return (request and request.user.is_authenticated
                 and obj.subscriptions_on_author.filter(
@@ -49,13 +91,13 @@ class SubscribtionsUserSerializer(FoodgramUserSerializer):
                                                        'recipes_count')
 
     def get_recipes(self, obj):
-        request = self.context['request']
-        recipes_limit = request.GET.get('recipes_limit')
-        try:
-            recipes_limit = int(recipes_limit)
-        except TypeError:
-            recipes_limit = None
-        recipes = obj.recipes.all()[:recipes_limit]
+        recipes_by_author = self.context.get('recipes_by_author')
+        if recipes_by_author is not None:
+            recipes = recipes_by_author.get(obj.id, [])
+        else:
+            recipes = obj.recipes.all()[
+                :get_recipes_limit(self.context['request'])
+            ]
 
         return ShortRecipeSerializer(
             recipes,
@@ -67,12 +109,15 @@ class SubscribtionsUserSerializer(FoodgramUserSerializer):
 class ShortRecipeSerializer(serializers.ModelSerializer):
     """Сериализатор рецепта. Короткий список данных."""
 
+    image_renditions = ImageRenditionsField(source='image')
+
     class Meta:
         model = Recipe
         fields = (
             'id',
             'name',
             'image',
+            'image_renditions',
             'cooking_time',
         )
 
@@ -183,8 +228,12 @@ class RecipeListSerializer(serializers.ModelSerializer):
         many=True,
         source='recipe_ingredients'
     )
-    is_favorited = serializers.SerializerMethodField()
-    is_in_shopping_cart = serializers.SerializerMethodField()
+    is_favorited = serializers.BooleanField(read_only=True, default=False)
+    is_in_shopping_cart = serializers.BooleanField(
+        read_only=True,
+        default=False
+    )
+    image_renditions = ImageRenditionsField(source='image')
 
     class Meta:
         model = Recipe
@@ -197,25 +246,93 @@ class RecipeListSerializer(serializers.ModelSerializer):
             'is_in_shopping_cart',
             'name',
             'image',
+            'image_renditions',
             'text',
             'cooking_time',
         )
 
-    def get_is_favorited(self, obj):
-        request = self.context.get('request')
-        return (
-            request
-            and request.user.is_authenticated
-            and obj.favourites.filter(user=request.user).exists()
-        )
+    def to_representation(self, instance):
+        if hasattr(instance, 'is_subscribed_to_author'):
+            instance.author.is_subscribed = instance.is_subscribed_to_author
+        return super().to_representation(instance)
+
+
+class FastRecipeListSerializer:
+    """Представление рецептов для чтения без полей DRF.
+
+    Собирает те же словари, что RecipeListSerializer, напрямую из
+    объектов with_related() и with_user_flags(). Поддерживает только
+    чтение через .data.
+    """
 
-    def get_is_in_shopping_cart(self, obj):
+    author_fields = tuple(
+        field for field in FoodgramUserSerializer.Meta.fields
+        if field not in ('is_subscribed', 'avatar', 'avatar_renditions')
+    )
+
+    def __init__(self, instance=None, many=False, context=None, **kwargs):
+        self.instance = instance
+        self.many = many
+        self.context = context or {}
         request = self.context.get('request')
-        return (
-            request
-            and request.user.is_authenticated
-            and obj.shoppingcart.filter(user=request.user).exists()
-        )
+        self.build_url = request.build_absolute_uri if request else None
+        self.authors = {}
+
+    def get_file_url(self, file):
+        if not file:
+            return None
+        return self.build_url(file.url) if self.build_url else file.url
+
+    def get_renditions(self, file):
+        if not file:
+            return None
+        return get_renditions(file.name, self.build_url)
+
+    def get_author(self, recipe):
+        author = recipe.author
+        key = (author.pk, getattr(recipe, 'is_subscribed_to_author', False))
+        if key not in self.authors:
+            data = {field: getattr(author, field)
+                    for field in self.author_fields}
+            data['is_subscribed'] = key[1]
+            data['avatar'] = self.get_file_url(author.avatar)
+            data['avatar_renditions'] = self.get_renditions(author.avatar)
+            self.authors[key] = data
+        return self.authors[key]
+
+    def to_representation(self, recipe):
+        return {
+            'id': recipe.id,
+            'tags': [
+                {'id': tag.id, 'name': tag.name, 'slug': tag.slug}
+                for tag in recipe.tags.all()
+            ],
+            'author': self.get_author(recipe),
+            'ingredients': [
+                {
+                    'id': item.ingredients.id,
+                    'name': item.ingredients.name,
+                    'amount': item.amount,
+                    'measurement_unit': item.ingredients.measurement_unit,
+                }
+                for item in recipe.recipe_ingredients.all()
+            ],
+            'is_favorited': getattr(recipe, 'is_favorited', False),
+            'is_in_shopping_cart': getattr(
+                recipe, 'is_in_shopping_cart', False
+            ),
+            'name': recipe.name,
+            'image': self.get_file_url(recipe.image),
+            'image_renditions': self.get_renditions(recipe.image),
+            'text': recipe.text,
+            'cooking_time': recipe.cooking_time,
+        }
+
+    @property
+    def data(self):
+        if self.many:
+            return [self.to_representation(item) for item in self.instance]
+        return self.to_representation(self.instance)
 
 
 class RecipeSerializer(serializers.ModelSerializer):
@@ -227,7 +344,7 @@ class RecipeSerializer(serializers.ModelSerializer):
     )
     author = FoodgramUserSerializer(read_only=True)
     ingredients = IngredientsCreateSerializer(many=True)
-    image = Base64ImageField(required=True)
+    image = ImageUploadField(required=True)
 
     class Meta:
         model = Recipe
@@ -243,6 +360,9 @@ class RecipeSerializer(serializers.ModelSerializer):
         )
 
     def to_representation(self, instance):
+        instance = Recipe.objects.with_related().with_user_flags(
+            self.context['request'].user
+        ).get(pk=instance.pk)
         return RecipeListSerializer(
             instance,
             context=self.context
@@ -275,9 +395,14 @@ class RecipeSerializer(serializers.ModelSerializer):
     def update(self, instance, validated_data):
         ingredients = validated_data.pop('ingredients', None)
         tags = validated_data.pop('tags', None)
+        old_amounts = get_recipe_amounts(instance)
         instance.tags.set(tags)
         instance.ingredients.clear()
         self.ingredient_list(self, instance, ingredients)
+        change_shopping_list(
+            get_shopping_cart_users(instance),
+            get_amounts_difference(old_amounts, get_recipe_amounts(instance))
+        )
         return super().update(instance, validated_data)
 
     def validate(self, data):
@@ -350,11 +475,12 @@ class ShoppingCartSerializer(BaseFavouritesShoppingCartSerializer):
 class AvatarSerializer(serializers.ModelSerializer):
     """Сериализатор аватара."""
 
-    avatar = Base64ImageField()
+    avatar = ImageUploadField()
+    avatar_renditions = ImageRenditionsField(source='avatar')
 
     class Meta:
         model = User
-        fields = ('avatar',)
+        fields = ('avatar', 'avatar_renditions')
 
     def validate(self, data):
         if 'avatar' not in data:
@@ -362,3 +488,8 @@ class AvatarSerializer(serializers.ModelSerializer):
                 'Поле "avatar" обязательно для заполнения'
             )
         return data
+
+    def update(self, instance, validated_data):
+        instance.avatar = validated_data['avatar']
+        instance.save(update_fields=('avatar',))
+        return instance
@@ -1,14 +1,228 @@
-def get_purchased_in_file(buy):
-    """Формирование списка покупок."""
-    purchased = [
-        'Список покупок:',
-    ]
-    for item in buy:
-        name = item['ingredients__name']
-        measurement_unit = item['ingredients__measurement_unit']
-        amount = item['amount']
-        purchased.append(
-            f'{name}: {amount}, '
-            f'{measurement_unit}'
-        )
-    return purchased
+import csv
+from collections import defaultdict
+from itertools import chain
+from tempfile import TemporaryFile
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from django.http import FileResponse
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFError, TTFont
+from reportlab.pdfgen import canvas
+
+from api.constants import (
+    PDF_FALLBACK_FONT_NAME,
+    PDF_FONT_NAME,
+    PDF_FONT_SIZE,
+    PDF_LINE_HEIGHT,
+    PDF_MARGIN,
+    SHOPPING_LIST_CSV_HEADER,
+    SHOPPING_LIST_TITLE
+)
+
+from food.models import (
+    Recipe,
+    RecipeIngredients,
+    ShoppingCart,
+    ShoppingListItem,
+    User
+)
+
+
+def get_recipes_limit(request):
+    """Ограничение количества рецептов в превью автора."""
+    try:
+        return int(request.GET.get('recipes_limit'))
+    except (TypeError, ValueError):
+        return None
+
+
+def get_recipes_preview(authors, recipes_limit=None):
+    """Превью рецептов всех авторов страницы одним запросом."""
+    recipes = Recipe.objects.filter(author__in=authors).only(
+        'id', 'author', 'name', 'image', 'cooking_time', 'pub_date'
+    )
+    if recipes_limit is not None:
+        sql, params = recipes.annotate(
+            row_number=Window(
+                expression=RowNumber(),
+                partition_by=F('author'),
+                order_by=F('pub_date').desc(),
+            )
+        ).query.sql_with_params()
+        recipes = Recipe.objects.raw(
+            f'SELECT * FROM ({sql}) AS previews '
+            'WHERE previews.row_number <= %s '
+            'ORDER BY previews.row_number',
+            (*params, recipes_limit)
+        )
+    recipes_by_author = defaultdict(list)
+    for recipe in recipes:
+        recipes_by_author[recipe.author_id].append(recipe)
+    return recipes_by_author
+
+
+def get_recipe_amounts(recipe, sign=1):
+    """Количества ингредиентов рецепта."""
+    return {
+        ingredient_id: sign * amount
+        for ingredient_id, amount in RecipeIngredients.objects.filter(
+            recipe=recipe
+        ).values_list('ingredients_id', 'amount')
+    }
+
+
+def get_amounts_difference(old_amounts, new_amounts):
+    """Разница количеств ингредиентов рецепта после изменения."""
+    return {
+        ingredient_id: (
+            new_amounts.get(ingredient_id, 0)
+            - old_amounts.get(ingredient_id, 0)
+        )
+        for ingredient_id in old_amounts.keys() | new_amounts.keys()
+    }
+
+
+def get_shopping_cart_users(recipe):
+    """Пользователи, у которых рецепт в списке покупок."""
+    return list(
+        ShoppingCart.objects.filter(recipe=recipe).values_list(
+            'user_id', flat=True
+        )
+    )
+
+
+@transaction.atomic
+def change_shopping_list(user_ids, amounts):
+    """Изменение сохраненных списков покупок на количества ингредиентов."""
+    amounts = {
+        ingredient_id: amount
+        for ingredient_id, amount in amounts.items()
+        if amount
+    }
+    if not user_ids or not amounts:
+        return
+    # Позиций, которых еще нет, select_for_update не заблокирует, поэтому
+    # изменения списков одного пользователя упорядочиваются блокировкой
+    # его строки, иначе два параллельных первых добавления ингредиента
+    # создают одну и ту же позицию.
+    list(
+        User.objects.select_for_update()
+        .filter(pk__in=user_ids)
+        .order_by('pk')
+        .values_list('pk', flat=True)
+    )
+    items = list(
+        ShoppingListItem.objects.select_for_update().filter(
+            user_id__in=user_ids,
+            ingredients_id__in=amounts
+        )
+    )
+    existing = set()
+    for item in items:
+        item.amount = F('amount') + amounts[item.ingredients_id]
+        existing.add((item.user_id, item.ingredients_id))
+    ShoppingListItem.objects.bulk_update(items, ('amount',))
+    ShoppingListItem.objects.bulk_create([
+        ShoppingListItem(
+            user_id=user_id,
+            ingredients_id=ingredient_id,
+            amount=amount
+        )
+        for user_id in user_ids
+        for ingredient_id, amount in amounts.items()
+        if (user_id, ingredient_id) not in existing and amount > 0
+    ])
+    ShoppingListItem.objects.filter(
+        user_id__in=user_ids,
+        amount__lte=0
+    ).delete()
+
+
+class Echo:
+    """Буфер, который сразу возвращает записанную строку."""
+
+    def write(self, value):
+        return value
+
+
+def shopping_list_txt(items):
+    """Построчная выгрузка списка покупок в txt."""
+    yield SHOPPING_LIST_TITLE
+    for item in items:
+        yield (
+            f'\n{item["ingredients__name"]}: {item["amount"]}, '
+            f'{item["ingredients__measurement_unit"]}'
+        )
+
+
+def shopping_list_csv(items):
+    """Построчная выгрузка списка покупок в csv."""
+    writer = csv.writer(Echo())
+    yield writer.writerow(SHOPPING_LIST_CSV_HEADER)
+    for item in items:
+        yield writer.writerow((
+            item['ingredients__name'],
+            item['amount'],
+            item['ingredients__measurement_unit'],
+        ))
+
+
+def get_pdf_font():
+    """Шрифт с кириллицей для pdf, если он доступен."""
+    if PDF_FONT_NAME in pdfmetrics.getRegisteredFontNames():
+        return PDF_FONT_NAME
+    try:
+        pdfmetrics.registerFont(
+            TTFont(PDF_FONT_NAME, settings.SHOPPING_LIST_PDF_FONT)
+        )
+    except TTFError:
+        return PDF_FALLBACK_FONT_NAME
+    return PDF_FONT_NAME
+
+
+def draw_shopping_list_pdf(items, file):
+    """Отрисовка списка покупок в pdf по мере чтения курсора."""
+    pdf = canvas.Canvas(file, pagesize=A4, pageCompression=1)
+    font = get_pdf_font()
+    _, height = A4
+    lines = chain(
+        (SHOPPING_LIST_TITLE,),
+        (
+            f'{item["ingredients__name"]}: {item["amount"]}, '
+            f'{item["ingredients__measurement_unit"]}'
+            for item in items
+        )
+    )
+    y = height - PDF_MARGIN
+    pdf.setFont(font, PDF_FONT_SIZE)
+    for line in lines:
+        if y < PDF_MARGIN:
+            pdf.showPage()
+            pdf.setFont(font, PDF_FONT_SIZE)
+            y = height - PDF_MARGIN
+        pdf.drawString(PDF_MARGIN, y, line)
+        y -= PDF_LINE_HEIGHT
+    pdf.save()
+
+
+def shopping_list_pdf(items):
+    """Выгрузка списка покупок в pdf.
+
+    Документ пишется во временный файл на диске и отдается из него
+    частями, в памяти на время отдачи ничего не остается.
+    """
+    with TemporaryFile() as file:
+        draw_shopping_list_pdf(items, file)
+        file.seek(0)
+        yield from iter(lambda: file.read(FileResponse.block_size), b'')
+
+
+SHOPPING_LIST_EXPORTS = {
+    'txt': shopping_list_txt,
+    'csv': shopping_list_csv,
+    'pdf': shopping_list_pdf,
+}
@@ -0,0 +1,167 @@
+from django.db.models import F
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete
+)
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from api.authentication import forget_tokens
+from api.cache import bump_version
+from api.constants import (
+    FAVOURITES_CACHE,
+    INGREDIENTS_CACHE,
+    RECIPE_CACHE,
+    RECIPES_CACHE,
+    SHOPPING_CART_CACHE,
+    SUBSCRIPTIONS_CACHE,
+    TAGS_CACHE,
+    USERS_CACHE
+)
+from api.images import schedule_renditions
+from api.services import change_shopping_list, get_recipe_amounts
+from food.models import Favourites, Ingredients, Recipe, ShoppingCart, Tag
+from food.services import short_link_cache
+from users.models import Subscribe, User
+
+
+@receiver((post_save, post_delete), sender=Tag)
+def reset_tags_cache(**kwargs):
+    bump_version(TAGS_CACHE)
+    bump_version(RECIPES_CACHE)
+
+
+@receiver((post_save, post_delete), sender=Ingredients)
+def reset_ingredients_cache(**kwargs):
+    bump_version(INGREDIENTS_CACHE)
+
+
+@receiver((post_save, post_delete), sender=Recipe)
+def reset_recipe_cache(instance, **kwargs):
+    bump_version(f'{RECIPE_CACHE}:{instance.pk}')
+    bump_version(RECIPES_CACHE)
+
+
+@receiver(post_save, sender=Recipe)
+def render_recipe_image(instance, **kwargs):
+    if instance.image:
+        schedule_renditions(instance.image.name)
+
+
+@receiver(post_delete, sender=Recipe)
+def forget_short_link(instance, **kwargs):
+    short_link_cache.discard(instance.pk)
+
+
+@receiver(m2m_changed, sender=Recipe.tags.through)
+def reset_recipe_tags_cache(instance, pk_set, **kwargs):
+    if isinstance(instance, Recipe):
+        bump_version(f'{RECIPE_CACHE}:{instance.pk}')
+    else:
+        for pk in pk_set or ():
+            bump_version(f'{RECIPE_CACHE}:{pk}')
+    bump_version(RECIPES_CACHE)
+
+
+@receiver(post_save, sender=User)
+def reset_users_cache(update_fields, **kwargs):
+    if update_fields and set(update_fields) == {'last_login'}:
+        return
+    bump_version(USERS_CACHE)
+
+
+@receiver(post_save, sender=User)
+def reset_user_tokens_cache(instance, update_fields, **kwargs):
+    if update_fields and set(update_fields) == {'last_login'}:
+        return
+    forget_tokens(*Token.objects.filter(user=instance).values_list(
+        'key', flat=True
+    ))
+
+
+@receiver(post_delete, sender=Token)
+def reset_token_cache(instance, **kwargs):
+    forget_tokens(instance.key)
+
+
+@receiver(post_save, sender=User)
+def render_avatar(instance, update_fields, **kwargs):
+    if update_fields and set(update_fields) == {'last_login'}:
+        return
+    if instance.avatar:
+        schedule_renditions(instance.avatar.name)
+
+
+def change_counter(model, pk, field, delta):
+    model.objects.filter(pk=pk).update(**{field: F(field) + delta})
+
+
+@receiver((post_save, post_delete), sender=Favourites)
+def reset_favourites_cache(instance, **kwargs):
+    bump_version(f'{FAVOURITES_CACHE}:{instance.user_id}')
+
+
+@receiver((post_save, post_delete), sender=ShoppingCart)
+def reset_shopping_cart_cache(instance, **kwargs):
+    bump_version(f'{SHOPPING_CART_CACHE}:{instance.user_id}')
+
+
+@receiver(post_save, sender=ShoppingCart)
+def add_to_shopping_list(instance, created, **kwargs):
+    if created:
+        change_shopping_list(
+            (instance.user_id,),
+            get_recipe_amounts(instance.recipe_id)
+        )
+
+
+@receiver(pre_delete, sender=ShoppingCart)
+def remove_from_shopping_list(instance, **kwargs):
+    # pre_delete, а не post_delete: при каскадном удалении рецепта или
+    # автора ингредиенты рецепта к post_delete могут быть уже удалены.
+    change_shopping_list(
+        (instance.user_id,),
+        get_recipe_amounts(instance.recipe_id, -1)
+    )
+
+
+@receiver((post_save, post_delete), sender=Subscribe)
+def reset_subscriptions_cache(instance, **kwargs):
+    bump_version(f'{SUBSCRIPTIONS_CACHE}:{instance.user_id}')
+
+
+# Счетчики меняются в сигналах, чтобы их учитывали админка, каскадное
+# удаление пользователей и рецептов и любые другие пути записи.
+@receiver(post_save, sender=Favourites)
+def increase_favorites_count(instance, created, **kwargs):
+    if created:
+        change_counter(Recipe, instance.recipe_id, 'favorites_count', 1)
+
+
+@receiver(post_delete, sender=Favourites)
+def decrease_favorites_count(instance, **kwargs):
+    change_counter(Recipe, instance.recipe_id, 'favorites_count', -1)
+
+
+@receiver(post_save, sender=Recipe)
+def increase_recipes_count(instance, created, **kwargs):
+    if created:
+        change_counter(User, instance.author_id, 'recipes_count', 1)
+
+
+@receiver(post_delete, sender=Recipe)
+def decrease_recipes_count(instance, **kwargs):
+    change_counter(User, instance.author_id, 'recipes_count', -1)
+
+
+@receiver(post_save, sender=Subscribe)
+def increase_subscribers_count(instance, created, **kwargs):
+    if created:
+        change_counter(User, instance.author_id, 'subscribers_count', 1)
+
+
+@receiver(post_delete, sender=Subscribe)
+def decrease_subscribers_count(instance, **kwargs):
+    change_counter(User, instance.author_id, 'subscribers_count', -1)
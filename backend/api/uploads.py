@@ -0,0 +1,59 @@
+import json
+
+from django.conf import settings
+from django.core.files.uploadhandler import FileUploadHandler
+from rest_framework import status
+from rest_framework.exceptions import APIException, ParseError
+from rest_framework.parsers import DataAndFiles, MultiPartParser
+
+from api.constants import UPLOAD_JSON_FIELD
+
+
+class RequestEntityTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = 'Размер запроса превышает допустимый.'
+    default_code = 'request_too_large'
+
+
+class MaxSizeUploadHandler(FileUploadHandler):
+    """Прерывает multipart загрузку, превысившую MAX_UPLOAD_SIZE.
+
+    Заявленный размер проверяется до чтения тела, а для запросов без
+    Content-Length считаются полученные байты файлов. Ставится первым
+    обработчиком только в MultiPartJSONParser, где ошибку превращает в
+    ответ 413 DRF.
+    """
+
+    def handle_raw_input(self, input_data, META, content_length, boundary,
+                         encoding=None):
+        if content_length > settings.MAX_UPLOAD_SIZE:
+            raise RequestEntityTooLarge
+        self.received = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > settings.MAX_UPLOAD_SIZE:
+            raise RequestEntityTooLarge
+        return raw_data
+
+    def file_complete(self, file_size):
+        return None
+
+
+class MultiPartJSONParser(MultiPartParser):
+    """Multipart запрос, где поля, кроме файлов, передаются JSON строкой."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context['request'].upload_handlers.insert(
+            0, MaxSizeUploadHandler()
+        )
+        parsed = super().parse(stream, media_type, parser_context)
+        if UPLOAD_JSON_FIELD not in parsed.data:
+            return parsed
+        try:
+            data = json.loads(parsed.data[UPLOAD_JSON_FIELD])
+        except ValueError as error:
+            raise ParseError(f'JSON parse error - {error}')
+        if not isinstance(data, dict):
+            raise ParseError(f'Поле {UPLOAD_JSON_FIELD} должно быть объектом')
+        return DataAndFiles(data, parsed.files.dict())
@@ -1,6 +1,7 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
+from .metrics import metrics_view
 from .views import (
     IngredientsViewSet,
     RecipesViewSet,
@@ -16,6 +17,7 @@ v1_router.register('tags', TagsViewSet, basename='tags')
 v1_router.register('users', FoodgramUserViewSet, basename='users')
 
 urlpatterns = [
+    path('_metrics', metrics_view, name='metrics'),
     path('', include(v1_router.urls)),
     path('auth/', include('djoser.urls.authtoken')),
 ]
@@ -1,6 +1,8 @@
-from django.db.models import Count, Sum
+from django.conf import settings
+from django.db import transaction
+from django.db.models import BooleanField, Value
 from django_filters.rest_framework import DjangoFilterBackend
-from django.http import FileResponse
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from djoser.views import UserViewSet
 from django.urls import reverse
@@ -9,14 +11,32 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet, ReadOnlyModelViewSet
 from rest_framework.pagination import LimitOffsetPagination
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import SAFE_METHODS, IsAuthenticated
 
-from api.filters import IngredientFilter, RecipeFilter
-from api.pagination import RecipesPagination
+from api.cache import get_etag
+from api.constants import (
+    INGREDIENTS_CACHE,
+    RECIPE_CACHE,
+    RECIPES_CACHE,
+    SHOPPING_LIST_CHUNK_SIZE,
+    TAGS_CACHE,
+    USERS_CACHE
+)
+from api.filters import RecipeFilter
+from api.mixins import AnonymousResponseCacheMixin, CachedReferenceMixin
+from api.pagination import RecipesPagination, SubscriptionsPagination
 from api.permissions import IsAuthenticatedOwnerOrReadOnly
+from api.renderers import (
+    ShoppingListCSVRenderer,
+    ShoppingListPDFRenderer,
+    ShoppingListTxtRenderer
+)
+from api.search import get_ingredient_index
 from api.serializers import (
     AvatarSerializer,
+    FastRecipeListSerializer,
     IngredientsSerializer,
+    RecipeListSerializer,
     RecipeSerializer,
     TagSerializer,
     FavouritesSerializer,
@@ -25,10 +45,13 @@ from api.serializers import (
     SubscribeCreateSerializer,
     ShoppingCartSerializer
 )
-from api.services import get_purchased_in_file
+from api.services import (
+    SHOPPING_LIST_EXPORTS,
+    get_recipes_limit,
+    get_recipes_preview
+)
 from food.models import (
     Ingredients,
-    RecipeIngredients,
     Favourites,
     ShoppingCart,
     Tag,
@@ -108,54 +131,88 @@ class FoodgramUserViewSet(UserViewSet):
 
     @put_avatar.mapping.delete
     def delete_avatar(self, request):
-        self.request.user.avatar.delete()
+        request.user.avatar.delete(save=False)
+        request.user.save(update_fields=('avatar',))
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     @action(
         methods=('GET',),
         detail=False,
-        permission_classes=(IsAuthenticated,)
+        permission_classes=(IsAuthenticated,),
+        pagination_class=SubscriptionsPagination
     )
     def subscriptions(self, request):
         authors = User.objects.filter(
             subscriptions_on_author__user=request.user
         ).annotate(
-            recipes_count=Count('recipes')
+            is_subscribed=Value(True, output_field=BooleanField())
         ).order_by('username')
+        page = self.paginate_queryset(authors)
+        context = self.get_serializer_context()
+        context['recipes_by_author'] = get_recipes_preview(
+            page,
+            get_recipes_limit(request)
+        )
         serializer = SubscribtionsUserSerializer(
-            self.paginate_queryset(authors),
+            page,
             many=True,
-            context=self.get_serializer_context()
+            context=context
         )
         return self.get_paginated_response(serializer.data)
 
 
-class IngredientsViewSet(ReadOnlyModelViewSet):
+class IngredientsViewSet(CachedReferenceMixin, ReadOnlyModelViewSet):
+    cache_name = INGREDIENTS_CACHE
     queryset = Ingredients.objects.all()
     serializer_class = IngredientsSerializer
     http_method_names = ('get',)
     pagination_class = None
-    filter_backends = (DjangoFilterBackend,)
-    filterset_class = IngredientFilter
+
+    def list(self, request, *args, **kwargs):
+        name = request.query_params.get('name')
+        if name is None:
+            return super().list(request, *args, **kwargs)
+        data, _ = self.get_cached_payload()
+        ingredients = get_ingredient_index(data).search(name)
+        return self.get_cached_response(ingredients, get_etag(ingredients))
 
 
-class TagsViewSet(ReadOnlyModelViewSet):
+class TagsViewSet(CachedReferenceMixin, ReadOnlyModelViewSet):
+    cache_name = TAGS_CACHE
     queryset = Tag.objects.all()
     serializer_class = TagSerializer
     http_method_names = ('get',)
     pagination_class = None
 
 
-class RecipesViewSet(ModelViewSet):
-    queryset = Recipe.objects.select_related(
-        'author'
-    ).all().prefetch_related('tags', 'ingredients')
+class RecipesViewSet(AnonymousResponseCacheMixin, ModelViewSet):
+    queryset = Recipe.objects.with_related()
     serializer_class = RecipeSerializer
     permission_classes = (IsAuthenticatedOwnerOrReadOnly,)
     filter_backends = (DjangoFilterBackend,)
     filterset_class = RecipeFilter
     pagination_class = RecipesPagination
 
+    def get_queryset(self):
+        return super().get_queryset().with_user_flags(self.request.user)
+
+    def get_response_cache_versions(self):
+        versions = (USERS_CACHE, TAGS_CACHE, INGREDIENTS_CACHE)
+        if self.action == 'retrieve':
+            return (f'{RECIPE_CACHE}:{self.kwargs["pk"]}', *versions)
+        return (RECIPES_CACHE, *versions)
+
+    def get_serializer_class(self):
+        if self.request.method in SAFE_METHODS:
+            if (
+                settings.FAST_RECIPE_SERIALIZER
+                and getattr(self.request, 'accepted_renderer', None)
+                and self.request.accepted_renderer.format == 'json'
+            ):
+                return FastRecipeListSerializer
+            return RecipeListSerializer
+        return RecipeSerializer
+
     def shopping_cart_favorite_create(self, serializator, pk):
         data = {'user': self.request.user.pk, 'recipe': pk}
         serializator = serializator(
@@ -195,6 +252,7 @@ class RecipesViewSet(ModelViewSet):
         detail=True,
         permission_classes=(IsAuthenticated,)
     )
+    @transaction.atomic
     def shopping_cart(self, request, pk):
         return self.shopping_cart_favorite_create(
             ShoppingCartSerializer,
@@ -202,6 +260,7 @@ class RecipesViewSet(ModelViewSet):
         )
 
     @shopping_cart.mapping.delete
+    @transaction.atomic
     def delete_shopping_cart(self, request, pk):
         delete, _ = ShoppingCart.objects.filter(
             user=request.user,
@@ -215,23 +274,36 @@ class RecipesViewSet(ModelViewSet):
         detail=False,
         methods=('GET',),
         permission_classes=(IsAuthenticated,),
+        renderer_classes=(
+            ShoppingListTxtRenderer,
+            ShoppingListCSVRenderer,
+            ShoppingListPDFRenderer,
+        ),
         url_path='download_shopping_cart',
         url_name='download_shopping_cart',
     )
     def download_shopping_cart(self, request):
         buy = (
-            RecipeIngredients.objects.filter(
-                recipe__shoppingcart__user=request.user
+            request.user.shopping_list
+            .values(
+                'ingredients__name',
+                'ingredients__measurement_unit',
+                'amount'
             )
-            .values('ingredients__name', 'ingredients__measurement_unit')
-            .annotate(amount=Sum('amount'))
             .order_by('ingredients__name')
+            .iterator(chunk_size=SHOPPING_LIST_CHUNK_SIZE)
+        )
+        renderer = request.accepted_renderer
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type = f'{content_type}; charset={renderer.charset}'
+        response = StreamingHttpResponse(
+            SHOPPING_LIST_EXPORTS[renderer.format](buy),
+            content_type=content_type
         )
-        purchased_in_file = '\n'.join(get_purchased_in_file(buy))
-        response = FileResponse(purchased_in_file, content_type='text/plain')
         response[
             'Content-Disposition'
-        ] = 'attachment; filename=shopping-list.txt'
+        ] = f'attachment; filename=shopping-list.{renderer.format}'
         return response
 
     @action(
@@ -240,8 +312,8 @@ class RecipesViewSet(ModelViewSet):
         url_path='get-link',
     )
     def get_link(self, request, pk):
-        recipe = get_object_or_404(Recipe, pk=pk)
+        recipe = get_object_or_404(Recipe.objects.only('id'), pk=pk)
         url = request.build_absolute_uri(
-            reverse('redirect_link', kwargs={'slug': recipe.short_url})
+            reverse('redirect_link', kwargs={'slug': recipe.short_link})
         )
         return Response({'short-link': url}, status=status.HTTP_200_OK)
@@ -2,6 +2,12 @@ from django.contrib import admin
 from django.contrib.auth.models import Group
 from django.utils.safestring import mark_safe
 
+from api.services import (
+    change_shopping_list,
+    get_amounts_difference,
+    get_recipe_amounts,
+    get_shopping_cart_users
+)
 from food.models import (
     Ingredients,
     Favourites,
@@ -16,6 +22,13 @@ class IngredientsInline(admin.StackedInline):
     model = RecipeIngredients
     extra = 1
     min_num = 1
+    autocomplete_fields = ('ingredients',)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related(
+            'recipe',
+            'ingredients'
+        )
 
 
 @admin.register(Recipe)
@@ -30,16 +43,32 @@ class RecipeAdmin(admin.ModelAdmin):
     )
     search_fields = ('name', 'author__username',)
     list_filter = ('tags',)
+    list_select_related = ('author',)
+    readonly_fields = ('favorites_count',)
+    autocomplete_fields = ('author',)
     inlines = (IngredientsInline,)
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).prefetch_related(
+            'tags',
+            'ingredients'
+        )
+
+    def save_related(self, request, form, formsets, change):
+        if not change:
+            return super().save_related(request, form, formsets, change)
+        recipe = form.instance
+        old_amounts = get_recipe_amounts(recipe)
+        super().save_related(request, form, formsets, change)
+        change_shopping_list(
+            get_shopping_cart_users(recipe),
+            get_amounts_difference(old_amounts, get_recipe_amounts(recipe))
+        )
+
     @admin.display(description='Изображение')
     def image_preview(self, obj):
         return mark_safe(f'<img src={obj.image.url} width="100" />')
 
-    @admin.display(description='Количество в избранном')
-    def favorites_count(self, obj):
-        return obj.favourites.count()
-
     @admin.display(description='Ингредиенты')
     def ingredients_list(self, obj):
         return ', '.join([
@@ -73,6 +102,7 @@ class ShoppingCartAdmin(admin.ModelAdmin):
         'user',
         'recipe',
     )
+    list_select_related = ('user', 'recipe__author')
 
 
 @admin.register(Favourites)
@@ -81,6 +111,7 @@ class FavouritesAdmin(admin.ModelAdmin):
         'user',
         'recipe',
     )
+    list_select_related = ('user', 'recipe__author')
 
 
 admin.site.unregister(Group)
@@ -1,7 +1,12 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class FoodConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'food'
     verbose_name = 'Еда'
+
+    def ready(self):
+        from food.search import restore_sqlite_search
+        post_migrate.connect(restore_sqlite_search, sender=self)
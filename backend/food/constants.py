@@ -10,3 +10,8 @@ MAX_NAME_LENGTH_TAG = 32
 MAX_SLUG_LENGTH_TAG = 32
 MAX_AMOUNT_VALUE = 32767
 MIN_AMOUNT_VALUE = 1
+SHORT_URL_LENGTH = 7
+SHORT_URL_MULTIPLIER = 2176477521739
+SHORT_URL_OFFSET = 1220703125
+SHORT_LINK_CACHE_SIZE = 100000
+SHORT_LINK_MAX_AGE = 60
@@ -0,0 +1,79 @@
+import json
+import sys
+
+from django.core.management.base import BaseCommand
+from django.db.models import Prefetch
+
+from food.models import Recipe, RecipeIngredients
+
+
+class Command(BaseCommand):
+    help = 'Выгрузка рецептов в файл JSON Lines'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            type=str,
+            default='-',
+            help='Путь к файлу, по умолчанию стандартный вывод'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Количество рецептов, читаемых за один запрос'
+        )
+
+    def get_recipes(self, batch_size):
+        queryset = Recipe.objects.order_by('pk').select_related(
+            'author'
+        ).prefetch_related(
+            'tags',
+            Prefetch(
+                'recipe_ingredients',
+                queryset=RecipeIngredients.objects.select_related(
+                    'ingredients'
+                )
+            )
+        )
+        last_pk = 0
+        while True:
+            batch = list(queryset.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                return
+            yield from batch
+            last_pk = batch[-1].pk
+
+    def handle(self, *args, **options):
+        file = (
+            sys.stdout if options['path'] == '-'
+            else open(options['path'], 'w', encoding='utf-8')
+        )
+        count = 0
+        try:
+            for recipe in self.get_recipes(options['batch_size']):
+                file.write(json.dumps({
+                    'name': recipe.name,
+                    'text': recipe.text,
+                    'cooking_time': recipe.cooking_time,
+                    'author': recipe.author.email,
+                    'image': recipe.image.name,
+                    'pub_date': recipe.pub_date.isoformat(),
+                    'short_url': recipe.short_url,
+                    'tags': [tag.slug for tag in recipe.tags.all()],
+                    'ingredients': [
+                        {
+                            'name': item.ingredients.name,
+                            'measurement_unit': (
+                                item.ingredients.measurement_unit
+                            ),
+                            'amount': item.amount,
+                        }
+                        for item in recipe.recipe_ingredients.all()
+                    ],
+                }, ensure_ascii=False) + '\n')
+                count += 1
+        finally:
+            if file is not sys.stdout:
+                file.close()
+        self.stderr.write(self.style.SUCCESS(f'Выгружено рецептов: {count}'))
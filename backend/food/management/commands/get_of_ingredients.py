@@ -1,31 +1,177 @@
 import csv
+import json
+import os
+from collections import defaultdict
+from itertools import islice
+from time import perf_counter
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
 
+from api.cache import bump_version
+from api.constants import INGREDIENTS_CACHE
 from food.models import Ingredients
 
+FORMATS = ('csv', 'json')
+READ_CHUNK_SIZE = 64 * 1024
+
+
+def read_csv(file):
+    """Строки csv файла по одной."""
+    for row in csv.reader(file):
+        if row:
+            name, measurement_unit = row
+            yield name.strip(), measurement_unit.strip()
+
+
+def read_json(file):
+    """Элементы JSON массива по одному, без чтения файла целиком."""
+    decoder = json.JSONDecoder()
+    buffer = file.read(READ_CHUNK_SIZE).lstrip()
+    if not buffer.startswith('['):
+        raise CommandError('Ожидается JSON массив')
+    buffer = buffer[1:]
+    while True:
+        buffer = buffer.lstrip().lstrip(',').lstrip()
+        if buffer.startswith(']'):
+            return
+        try:
+            item, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError:
+            chunk = file.read(READ_CHUNK_SIZE)
+            if not chunk:
+                raise CommandError('Некорректный JSON')
+            buffer += chunk
+            continue
+        buffer = buffer[end:]
+        yield item['name'].strip(), item['measurement_unit'].strip()
+
 
 class Command(BaseCommand):
-    help = 'Загрузка данных из csv файла в модель Ingredients'
-    stealth_options = True
+    help = 'Загрузка данных из csv или json файла в модель Ingredients'
 
     def add_arguments(self, parser):
-        parser.add_argument('--path', type=str, help='Путь к файлу')
+        parser.add_argument(
+            '--path',
+            type=str,
+            help='Путь к файлу или к каталогу с ingredients.csv'
+        )
+        parser.add_argument(
+            '--format',
+            choices=FORMATS,
+            help='Формат файла, по умолчанию по расширению'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Количество строк в одной транзакции'
+        )
+        parser.add_argument(
+            '--update-units',
+            action='store_true',
+            help=(
+                'Менять единицу измерения ингредиента, если в базе и в '
+                'файле он встречается с одной единицей'
+            )
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только посчитать изменения, не записывая их'
+        )
+
+    def get_file(self, path, file_format):
+        if os.path.isdir(path):
+            for extension in (file_format,) if file_format else FORMATS:
+                file_path = os.path.join(path, f'ingredients.{extension}')
+                if os.path.exists(file_path):
+                    return file_path, extension
+            raise CommandError('Файл не существует')
+        if not os.path.exists(path):
+            raise CommandError('Файл не существует')
+        extension = os.path.splitext(path)[1].lstrip('.').lower()
+        file_format = file_format or extension
+        if file_format not in FORMATS:
+            raise CommandError('Укажите формат файла через --format')
+        return path, file_format
+
+    def upsert(self, batch, dry_run, update_units):
+        """Создание новых пар название и единица измерения.
+
+        Существующие ингредиенты меняются только с --update-units и только
+        когда название однозначно: одна строка в базе и одна единица
+        измерения в файле.
+        """
+        units = defaultdict(set)
+        for name, measurement_unit in batch:
+            units[name].add(measurement_unit)
+        existing = defaultdict(list)
+        for ingredient in Ingredients.objects.filter(name__in=units):
+            existing[ingredient.name].append(ingredient)
+        created = []
+        updated = []
+        for name, measurement_units in units.items():
+            found = existing[name]
+            new_units = measurement_units - {
+                ingredient.measurement_unit for ingredient in found
+            }
+            if (
+                update_units
+                and new_units
+                and len(found) == 1
+                and len(measurement_units) == 1
+                and name not in self.names
+            ):
+                found[0].measurement_unit = new_units.pop()
+                updated.append(found[0])
+                continue
+            created += [
+                Ingredients(name=name, measurement_unit=measurement_unit)
+                for measurement_unit in sorted(new_units)
+            ]
+        self.names |= units.keys()
+        if not dry_run:
+            with transaction.atomic():
+                Ingredients.objects.bulk_create(created)
+                Ingredients.objects.bulk_update(
+                    updated, ('measurement_unit',)
+                )
+        self.counts['read'] += len(batch)
+        self.counts['created'] += len(created)
+        self.counts['updated'] += len(updated)
 
     def handle(self, *args, **options):
-        self.stdout.write(self.style.SUCCESS('Загрузка данных...'))
-        file_path = options['path'] + 'ingredients.csv'
-        try:
-            with open(file_path, encoding='utf-8') as file:
-                ingredients = list(csv.reader(file))
-                Ingredients.objects.bulk_create([
-                    Ingredients(
-                        name=name,
-                        measurement_unit=measurement_unit
-                    )
-                    for name, measurement_unit in ingredients
-                ], ignore_conflicts=True)
-                self.stdout.write(self.style.SUCCESS('Данные загружены'))
-        except FileNotFoundError:
-            self.stdout.write(self.style.ERROR('Файл не существует'))
-            return
+        if not options['path']:
+            raise CommandError('Укажите путь через --path')
+        file_path, file_format = self.get_file(
+            options['path'], options['format']
+        )
+        self.stdout.write(self.style.SUCCESS(f'Загрузка {file_path}...'))
+        self.counts = {'read': 0, 'created': 0, 'updated': 0}
+        self.names = set()
+        start = perf_counter()
+        with open(file_path, encoding='utf-8', newline='') as file:
+            rows = read_csv(file) if file_format == 'csv' else read_json(file)
+            while True:
+                batch = list(islice(rows, options['batch_size']))
+                if not batch:
+                    break
+                self.upsert(
+                    batch, options['dry_run'], options['update_units']
+                )
+        if not options['dry_run'] and (
+            self.counts['created'] or self.counts['updated']
+        ):
+            bump_version(INGREDIENTS_CACHE)
+        elapsed = perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            '{prefix}Прочитано {read}, создано {created}, '
+            'обновлено {updated} за {elapsed:.2f} с '
+            '({speed:.0f} строк/с)'.format(
+                prefix='[dry-run] ' if options['dry_run'] else '',
+                elapsed=elapsed,
+                speed=self.counts['read'] / elapsed if elapsed else 0,
+                **self.counts
+            )
+        ))
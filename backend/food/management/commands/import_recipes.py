@@ -0,0 +1,150 @@
+import json
+from itertools import islice
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import F
+from django.utils.dateparse import parse_datetime
+
+from api.cache import bump_version
+from api.constants import RECIPES_CACHE
+from food.models import Ingredients, Recipe, RecipeIngredients, Tag, User
+from food.services import bulk_create_with_pks
+
+
+class Command(BaseCommand):
+    help = 'Загрузка рецептов из файла JSON Lines пакетами'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', type=str, help='Путь к файлу')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Количество рецептов в одной транзакции'
+        )
+
+    def keep_short_urls(self, recipes):
+        """Старые короткие ссылки, которые ещё свободны в базе."""
+        taken = set(Recipe.objects.filter(
+            short_url__in=[
+                recipe.short_url for recipe in recipes if recipe.short_url
+            ]
+        ).values_list('short_url', flat=True))
+        for recipe in recipes:
+            if recipe.short_url in taken:
+                recipe.short_url = None
+            elif recipe.short_url:
+                taken.add(recipe.short_url)
+
+    def get_objects(self, model, lookups, key):
+        """Объекты справочника по ключам, отсутствующим в кеше."""
+        missing = set(lookups) - self.cache[model].keys()
+        if missing:
+            for obj in model.objects.filter(**{f'{key}__in': missing}):
+                self.cache[model][getattr(obj, key)] = obj
+
+    def get_ingredient(self, name, measurement_unit):
+        key = (name, measurement_unit)
+        if key not in self.cache[Ingredients]:
+            self.cache[Ingredients][key] = Ingredients.objects.filter(
+                name=name,
+                measurement_unit=measurement_unit
+            ).first()
+        return self.cache[Ingredients][key]
+
+    @transaction.atomic
+    def import_batch(self, lines):
+        rows = [json.loads(line) for line in lines]
+        self.get_objects(User, {row['author'] for row in rows}, 'email')
+        self.get_objects(
+            Tag, {slug for row in rows for slug in row['tags']}, 'slug'
+        )
+        recipes = []
+        relations = []
+        for row in rows:
+            author = self.cache[User].get(row['author'])
+            ingredients = [
+                (
+                    self.get_ingredient(
+                        item['name'], item['measurement_unit']
+                    ),
+                    item['amount']
+                )
+                for item in row['ingredients']
+            ]
+            tags = [self.cache[Tag].get(slug) for slug in row['tags']]
+            if (
+                author is None
+                or None in tags
+                or any(item is None for item, _ in ingredients)
+            ):
+                self.skipped += 1
+                continue
+            recipes.append(Recipe(
+                author=author,
+                name=row['name'],
+                text=row['text'],
+                cooking_time=row['cooking_time'],
+                image=row['image'],
+                short_url=row.get('short_url') or None,
+            ))
+            relations.append((row.get('pub_date'), tags, ingredients))
+        if not recipes:
+            return
+        self.keep_short_urls(recipes)
+        bulk_create_with_pks(Recipe, recipes)
+        dated = []
+        for recipe, (pub_date, _, _) in zip(recipes, relations):
+            if pub_date:
+                recipe.pub_date = parse_datetime(pub_date)
+                dated.append(recipe)
+        Recipe.objects.bulk_update(dated, ('pub_date',))
+        Recipe.tags.through.objects.bulk_create([
+            Recipe.tags.through(recipe_id=recipe.pk, tag_id=tag.pk)
+            for recipe, (_, tags, _) in zip(recipes, relations)
+            for tag in tags
+        ])
+        RecipeIngredients.objects.bulk_create([
+            RecipeIngredients(
+                recipe_id=recipe.pk,
+                ingredients=ingredient,
+                amount=amount
+            )
+            for recipe, (_, _, ingredients) in zip(recipes, relations)
+            for ingredient, amount in ingredients
+        ])
+        authors = {}
+        for recipe in recipes:
+            authors[recipe.author_id] = authors.get(recipe.author_id, 0) + 1
+        for author_id, count in authors.items():
+            User.objects.filter(pk=author_id).update(
+                recipes_count=F('recipes_count') + count
+            )
+        self.imported += len(recipes)
+
+    def handle(self, *args, **options):
+        if not options['path']:
+            raise CommandError('Укажите путь к файлу через --path')
+        self.cache = {User: {}, Tag: {}, Ingredients: {}}
+        self.imported = 0
+        self.skipped = 0
+        start = perf_counter()
+        try:
+            with open(options['path'], encoding='utf-8') as file:
+                lines = (line for line in file if line.strip())
+                while True:
+                    batch = list(islice(lines, options['batch_size']))
+                    if not batch:
+                        break
+                    self.import_batch(batch)
+                    self.stdout.write(f'Загружено рецептов: {self.imported}')
+        except FileNotFoundError:
+            raise CommandError('Файл не существует')
+        bump_version(RECIPES_CACHE)
+        elapsed = perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено {self.imported}, пропущено {self.skipped} '
+            f'за {elapsed:.1f} с'
+        ))
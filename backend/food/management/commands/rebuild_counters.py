@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from food.models import Favourites, Recipe, User
+from users.models import Subscribe
+
+COUNTERS = (
+    (Recipe, 'favorites_count', Favourites, 'recipe'),
+    (User, 'recipes_count', Recipe, 'author'),
+    (User, 'subscribers_count', Subscribe, 'author'),
+)
+
+
+def count_related(model, field):
+    """Фактическое количество связанных объектов."""
+    return Coalesce(
+        Subquery(
+            model.objects.filter(**{field: OuterRef('pk')})
+            .order_by()
+            .values(field)
+            .annotate(count=Count('pk'))
+            .values('count')
+        ),
+        0
+    )
+
+
+class Command(BaseCommand):
+    help = 'Проверка и пересчет счетчиков избранного, рецептов и подписчиков'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Только проверить счетчики без пересчета'
+        )
+
+    @transaction.atomic
+    def handle(self, *args, **options):
+        for model, counter, related, field in COUNTERS:
+            wrong = model.objects.alias(
+                actual=count_related(related, field)
+            ).exclude(**{counter: F('actual')}).count()
+            name = f'{model._meta.verbose_name_plural}.{counter}'
+            if not wrong:
+                self.stdout.write(self.style.SUCCESS(f'{name}: верно'))
+                continue
+            self.stdout.write(
+                self.style.WARNING(f'{name}: неверно у {wrong} записей')
+            )
+            if not options['check']:
+                model.objects.update(
+                    **{counter: count_related(related, field)}
+                )
+                self.stdout.write(self.style.SUCCESS(f'{name}: пересчитано'))
@@ -0,0 +1,73 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Sum
+
+from food.models import RecipeIngredients, ShoppingListItem
+
+BATCH_SIZE = 500
+
+
+def batches(items):
+    items = list(items)
+    for start in range(0, len(items), BATCH_SIZE):
+        yield items[start:start + BATCH_SIZE]
+
+
+class Command(BaseCommand):
+    help = 'Проверка и пересчет сохраненных списков покупок по корзинам'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Только проверить списки покупок без пересчета'
+        )
+
+    @transaction.atomic
+    def handle(self, *args, **options):
+        expected = {
+            (item['recipe__shoppingcart__user'], item['ingredients']):
+                item['amount']
+            for item in RecipeIngredients.objects.filter(
+                recipe__shoppingcart__isnull=False
+            ).values(
+                'recipe__shoppingcart__user', 'ingredients'
+            ).annotate(amount=Sum('amount')).order_by().iterator()
+        }
+        actual = {
+            (user, ingredient): amount
+            for user, ingredient, amount in (
+                ShoppingListItem.objects.values_list(
+                    'user_id', 'ingredients_id', 'amount'
+                ).iterator()
+            )
+        }
+        wrong = {
+            user for user, ingredient in expected.keys() | actual.keys()
+            if expected.get((user, ingredient))
+            != actual.get((user, ingredient))
+        }
+        name = ShoppingListItem._meta.verbose_name_plural
+        if not wrong:
+            self.stdout.write(self.style.SUCCESS(f'{name}: верно'))
+            return
+        self.stdout.write(self.style.WARNING(
+            f'{name}: неверно у {len(wrong)} пользователей'
+        ))
+        if options['check']:
+            return
+        for users in batches(wrong):
+            ShoppingListItem.objects.filter(user_id__in=users).delete()
+        ShoppingListItem.objects.bulk_create(
+            (
+                ShoppingListItem(
+                    user_id=user,
+                    ingredients_id=ingredient,
+                    amount=amount
+                )
+                for (user, ingredient), amount in expected.items()
+                if user in wrong
+            ),
+            batch_size=BATCH_SIZE
+        )
+        self.stdout.write(self.style.SUCCESS(f'{name}: пересчитано'))
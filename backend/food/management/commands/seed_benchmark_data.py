@@ -0,0 +1,222 @@
+import random
+from datetime import timedelta
+from io import BytesIO
+
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from PIL import Image
+
+from api.cache import bump_version
+from api.constants import RECIPES_CACHE, TAGS_CACHE, USERS_CACHE
+from food.models import (
+    Favourites,
+    Ingredients,
+    Recipe,
+    RecipeIngredients,
+    ShoppingCart,
+    Tag,
+    User
+)
+from food.services import bulk_create_with_pks
+from users.models import Subscribe
+
+USERNAME_PREFIX = 'bench'
+PASSWORD = 'benchmark'
+IMAGE_NAME = 'recipes/images/benchmark.png'
+AMOUNTS = (1, 2, 3, 5, 10, 50, 100, 150, 200, 250, 500)
+
+
+class Command(BaseCommand):
+    help = (
+        'Генерация синтетических пользователей, рецептов, подписок, '
+        'избранного и корзин для нагрузочного тестирования'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--recipes', type=int, default=10000)
+        parser.add_argument('--tags', type=int, default=12)
+        parser.add_argument(
+            '--ingredients',
+            type=float,
+            default=8,
+            help='Среднее количество ингредиентов в рецепте'
+        )
+        parser.add_argument(
+            '--subscriptions',
+            type=float,
+            default=8,
+            help='Среднее количество подписок на пользователя'
+        )
+        parser.add_argument(
+            '--favourites',
+            type=float,
+            default=15,
+            help='Среднее количество избранных рецептов на пользователя'
+        )
+        parser.add_argument(
+            '--cart',
+            type=float,
+            default=4,
+            help='Среднее количество рецептов в корзине пользователя'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Начальное значение генератора случайных чисел'
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def batches(self, items):
+        size = self.batch_size
+        for start in range(0, len(items), size):
+            yield items[start:start + size]
+
+    def get_image(self):
+        if not default_storage.exists(IMAGE_NAME):
+            buffer = BytesIO()
+            Image.new('RGB', (1280, 960), (230, 180, 120)).save(
+                buffer, 'PNG'
+            )
+            default_storage.save(IMAGE_NAME, ContentFile(buffer.getvalue()))
+        return IMAGE_NAME
+
+    def create_tags(self, count):
+        tags = list(Tag.objects.order_by('pk')[:count])
+        Tag.objects.bulk_create([
+            Tag(name=f'Тег {number}', slug=f'{USERNAME_PREFIX}-{number}')
+            for number in range(len(tags), count)
+        ])
+        return list(Tag.objects.order_by('pk').values_list(
+            'pk', flat=True
+        )[:count])
+
+    def create_users(self, count):
+        offset = User.objects.filter(
+            username__startswith=USERNAME_PREFIX
+        ).count()
+        password = make_password(PASSWORD)
+        users = []
+        for batch in self.batches(range(offset, offset + count)):
+            with transaction.atomic():
+                users += bulk_create_with_pks(User, [
+                    User(
+                        username=f'{USERNAME_PREFIX}{number}',
+                        email=f'{USERNAME_PREFIX}{number}@example.org',
+                        first_name='Имя',
+                        last_name='Фамилия',
+                        password=password
+                    )
+                    for number in batch
+                ])
+        return [user.pk for user in users]
+
+    def create_recipes(
+        self, count, users, tags, ingredients, average, image
+    ):
+        rng = self.rng
+        author_weights = [rng.paretovariate(1.2) for _ in users]
+        authors = rng.choices(users, author_weights, k=count)
+        now = timezone.now()
+        recipe_ids = []
+        for batch in self.batches(authors):
+            recipes = [
+                Recipe(
+                    author_id=author,
+                    name=f'Рецепт {len(recipe_ids) + number}',
+                    text='Описание рецепта. ' * rng.randint(5, 40),
+                    cooking_time=min(
+                        600, max(1, int(rng.lognormvariate(3.4, 0.6)))
+                    ),
+                    image=image
+                )
+                for number, author in enumerate(batch)
+            ]
+            with transaction.atomic():
+                bulk_create_with_pks(Recipe, recipes)
+                for recipe in recipes:
+                    recipe.pub_date = now - timedelta(
+                        seconds=rng.randint(0, 365 * 24 * 60 * 60)
+                    )
+                Recipe.objects.bulk_update(recipes, ('pub_date',))
+                Recipe.tags.through.objects.bulk_create([
+                    Recipe.tags.through(recipe_id=recipe.pk, tag_id=tag)
+                    for recipe in recipes
+                    for tag in rng.sample(
+                        tags, min(len(tags), rng.randint(1, 3))
+                    )
+                ])
+                RecipeIngredients.objects.bulk_create([
+                    RecipeIngredients(
+                        recipe_id=recipe.pk,
+                        ingredients_id=ingredient,
+                        amount=rng.choice(AMOUNTS)
+                    )
+                    for recipe in recipes
+                    for ingredient in rng.sample(
+                        ingredients,
+                        min(
+                            len(ingredients),
+                            max(1, round(rng.gauss(average, 3)))
+                        )
+                    )
+                ])
+            recipe_ids += [recipe.pk for recipe in recipes]
+        return recipe_ids
+
+    def create_pairs(self, model, field, users, targets, average):
+        """Связи пользователей с популярными объектами, без повторов."""
+        rng = self.rng
+        weights = [rng.paretovariate(1.1) for _ in targets]
+        rows = []
+        for user in users:
+            count = min(len(targets), int(rng.expovariate(1 / average)))
+            chosen = set(rng.choices(targets, weights, k=count))
+            chosen.discard(user if field == 'author_id' else None)
+            rows += [
+                model(user_id=user, **{field: target}) for target in chosen
+            ]
+        for batch in self.batches(rows):
+            model.objects.bulk_create(batch)
+        return len(rows)
+
+    def handle(self, *args, **options):
+        ingredients = list(Ingredients.objects.values_list('pk', flat=True))
+        if not ingredients:
+            raise CommandError(
+                'Нет ингредиентов, сначала выполните get_of_ingredients'
+            )
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        tags = self.create_tags(options['tags'])
+        users = self.create_users(options['users'])
+        self.stdout.write(f'Пользователей: {len(users)}')
+        recipes = self.create_recipes(
+            options['recipes'],
+            users,
+            tags,
+            ingredients,
+            options['ingredients'],
+            self.get_image()
+        )
+        self.stdout.write(f'Рецептов: {len(recipes)}')
+        for model, field, targets, average in (
+            (Subscribe, 'author_id', users, options['subscriptions']),
+            (Favourites, 'recipe_id', recipes, options['favourites']),
+            (ShoppingCart, 'recipe_id', recipes, options['cart']),
+        ):
+            count = self.create_pairs(model, field, users, targets, average)
+            self.stdout.write(f'{model._meta.verbose_name_plural}: {count}')
+        call_command('rebuild_shopping_lists', stdout=self.stdout)
+        call_command('rebuild_counters', stdout=self.stdout)
+        for name in (TAGS_CACHE, RECIPES_CACHE, USERS_CACHE):
+            bump_version(name)
+        self.stdout.write(self.style.SUCCESS(
+            f'Данные созданы, пароль пользователей: {PASSWORD}'
+        ))
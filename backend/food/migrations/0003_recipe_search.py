@@ -0,0 +1,96 @@
+from django.db import migrations
+
+POSTGRESQL_FORWARD = (
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    'CREATE INDEX food_recipe_name_trgm '
+    'ON food_recipe USING gin (name gin_trgm_ops)',
+    'CREATE INDEX food_ingredients_name_trgm '
+    'ON food_ingredients USING gin (name gin_trgm_ops)',
+    "CREATE INDEX food_recipe_search_vector ON food_recipe USING gin ("
+    "(to_tsvector('russian'::regconfig, "
+    "COALESCE(name, '') || ' ' || COALESCE(text, ''))))",
+)
+POSTGRESQL_BACKWARD = (
+    'DROP INDEX IF EXISTS food_recipe_search_vector',
+    'DROP INDEX IF EXISTS food_ingredients_name_trgm',
+    'DROP INDEX IF EXISTS food_recipe_name_trgm',
+)
+
+RECIPE_INGREDIENT_NAMES = (
+    "SELECT group_concat(i.name, ' ') FROM food_recipeingredients ri "
+    'JOIN food_ingredients i ON i.id = ri.ingredients_id '
+    'WHERE ri.recipe_id = {recipe_id}'
+)
+SQLITE_FORWARD = (
+    'CREATE VIRTUAL TABLE food_recipe_search '
+    'USING fts5(name, text, ingredients)',
+    'INSERT INTO food_recipe_search(rowid, name, text, ingredients) '
+    'SELECT r.id, r.name, r.text, COALESCE(({}), \'\') '
+    'FROM food_recipe r'.format(
+        RECIPE_INGREDIENT_NAMES.format(recipe_id='r.id')
+    ),
+    'CREATE TRIGGER food_recipe_search_insert AFTER INSERT ON food_recipe '
+    'BEGIN INSERT INTO food_recipe_search(rowid, name, text, ingredients) '
+    "VALUES (new.id, new.name, new.text, ''); END",
+    'CREATE TRIGGER food_recipe_search_update '
+    'AFTER UPDATE OF name, text ON food_recipe '
+    'BEGIN UPDATE food_recipe_search SET name = new.name, text = new.text '
+    'WHERE rowid = new.id; END',
+    'CREATE TRIGGER food_recipe_search_delete AFTER DELETE ON food_recipe '
+    'BEGIN DELETE FROM food_recipe_search WHERE rowid = old.id; END',
+    'CREATE TRIGGER food_recipeingredients_search_insert '
+    'AFTER INSERT ON food_recipeingredients '
+    'BEGIN UPDATE food_recipe_search SET ingredients = ({}) '
+    'WHERE rowid = new.recipe_id; END'.format(
+        RECIPE_INGREDIENT_NAMES.format(recipe_id='new.recipe_id')
+    ),
+    'CREATE TRIGGER food_recipeingredients_search_delete '
+    'AFTER DELETE ON food_recipeingredients '
+    'BEGIN UPDATE food_recipe_search SET ingredients = ({}) '
+    'WHERE rowid = old.recipe_id; END'.format(
+        RECIPE_INGREDIENT_NAMES.format(recipe_id='old.recipe_id')
+    ),
+    'CREATE TRIGGER food_ingredients_search_update '
+    'AFTER UPDATE OF name ON food_ingredients '
+    'BEGIN UPDATE food_recipe_search SET ingredients = ({}) '
+    'WHERE rowid IN (SELECT recipe_id FROM food_recipeingredients '
+    'WHERE ingredients_id = new.id); END'.format(
+        RECIPE_INGREDIENT_NAMES.format(recipe_id='food_recipe_search.rowid')
+    ),
+)
+SQLITE_BACKWARD = (
+    'DROP TRIGGER IF EXISTS food_ingredients_search_update',
+    'DROP TRIGGER IF EXISTS food_recipeingredients_search_delete',
+    'DROP TRIGGER IF EXISTS food_recipeingredients_search_insert',
+    'DROP TRIGGER IF EXISTS food_recipe_search_delete',
+    'DROP TRIGGER IF EXISTS food_recipe_search_update',
+    'DROP TRIGGER IF EXISTS food_recipe_search_insert',
+    'DROP TABLE IF EXISTS food_recipe_search',
+)
+
+
+def run_statements(statements):
+    def run(apps, schema_editor):
+        for statement in statements.get(schema_editor.connection.vendor, ()):
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('food', '0002_shoppinglistitem'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_statements({
+                'postgresql': POSTGRESQL_FORWARD,
+                'sqlite': SQLITE_FORWARD,
+            }),
+            run_statements({
+                'postgresql': POSTGRESQL_BACKWARD,
+                'sqlite': SQLITE_BACKWARD,
+            }),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 3.2.16 on 2026-10-18 02:10
+
+from django.db import migrations, models
+
+
+def clear_blank_short_urls(apps, schema_editor):
+    apps.get_model('food', 'Recipe').objects.filter(
+        short_url=''
+    ).update(short_url=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('food', '0005_recipe_favorites_count'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='recipe',
+            name='short_url',
+            field=models.CharField(blank=True, max_length=6, null=True, unique=True, verbose_name='Старая короткая ссылка'),
+        ),
+        migrations.RunPython(clear_blank_short_urls, migrations.RunPython.noop),
+    ]
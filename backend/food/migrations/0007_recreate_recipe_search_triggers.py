@@ -0,0 +1,36 @@
+from importlib import import_module
+
+from django.db import migrations
+
+search = import_module('food.migrations.0003_recipe_search')
+
+# SQLite пересоздает food_recipe при AlterField и AddField с default
+# (0005, 0006) и удаляет при этом триггеры таблицы. Триггеры нужно
+# вернуть, а индекс заполнить заново. После следующих миграций это
+# делает обработчик post_migrate food.search.restore_sqlite_search.
+SQLITE_FORWARD = (
+    'DROP TRIGGER IF EXISTS food_recipe_search_insert',
+    'DROP TRIGGER IF EXISTS food_recipe_search_update',
+    'DROP TRIGGER IF EXISTS food_recipe_search_delete',
+    'DELETE FROM food_recipe_search',
+) + tuple(
+    statement for statement in search.SQLITE_FORWARD
+    if statement.startswith((
+        'INSERT INTO food_recipe_search',
+        'CREATE TRIGGER food_recipe_search_',
+    ))
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('food', '0006_recipe_legacy_short_url'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            search.run_statements({'sqlite': SQLITE_FORWARD}),
+            migrations.RunPython.noop,
+        ),
+    ]
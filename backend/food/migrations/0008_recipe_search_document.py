@@ -0,0 +1,93 @@
+from importlib import import_module
+
+from django.db import migrations
+
+search = import_module('food.migrations.0003_recipe_search')
+
+# Документ поиска хранится в столбце food_recipe вместе с названиями
+# ингредиентов и обновляется триггерами, поэтому условие поиска целиком
+# обслуживается индексами самой таблицы рецептов. Столбец не описан в
+# модели, чтобы не читать его в каждом запросе рецептов.
+POSTGRESQL_FORWARD = (
+    'DROP INDEX IF EXISTS food_recipe_search_vector',
+    'DROP INDEX IF EXISTS food_ingredients_name_trgm',
+    'ALTER TABLE food_recipe ADD COLUMN search_document tsvector',
+    'CREATE FUNCTION food_recipe_search_document(bigint, text, text) '
+    'RETURNS tsvector LANGUAGE sql STABLE AS $$ '
+    "SELECT setweight(to_tsvector('russian', COALESCE($2, '')), 'A') "
+    "|| setweight(to_tsvector('russian', COALESCE(("
+    "SELECT string_agg(i.name, ' ') FROM food_recipeingredients ri "
+    'JOIN food_ingredients i ON i.id = ri.ingredients_id '
+    "WHERE ri.recipe_id = $1), '')), 'B') "
+    "|| setweight(to_tsvector('russian', COALESCE($3, '')), 'C') $$",
+    'CREATE FUNCTION food_recipe_search() RETURNS trigger '
+    'LANGUAGE plpgsql AS $$ BEGIN '
+    'NEW.search_document := food_recipe_search_document('
+    'NEW.id, NEW.name, NEW.text); '
+    'RETURN NEW; END $$',
+    'CREATE TRIGGER food_recipe_search '
+    'BEFORE INSERT OR UPDATE OF name, text ON food_recipe '
+    'FOR EACH ROW EXECUTE PROCEDURE food_recipe_search()',
+    'CREATE FUNCTION food_recipeingredients_search() RETURNS trigger '
+    'LANGUAGE plpgsql AS $$ BEGIN '
+    'UPDATE food_recipe SET search_document = '
+    'food_recipe_search_document(id, name, text) '
+    'WHERE id IN (SELECT recipe_id FROM changed_rows); '
+    'RETURN NULL; END $$',
+    'CREATE TRIGGER food_recipeingredients_search_insert '
+    'AFTER INSERT ON food_recipeingredients '
+    'REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT '
+    'EXECUTE PROCEDURE food_recipeingredients_search()',
+    'CREATE TRIGGER food_recipeingredients_search_delete '
+    'AFTER DELETE ON food_recipeingredients '
+    'REFERENCING OLD TABLE AS changed_rows FOR EACH STATEMENT '
+    'EXECUTE PROCEDURE food_recipeingredients_search()',
+    'CREATE FUNCTION food_ingredients_search() RETURNS trigger '
+    'LANGUAGE plpgsql AS $$ BEGIN '
+    'UPDATE food_recipe SET search_document = '
+    'food_recipe_search_document(id, name, text) '
+    'WHERE id IN (SELECT ri.recipe_id FROM food_recipeingredients ri '
+    'JOIN new_rows n ON n.id = ri.ingredients_id '
+    'JOIN old_rows o ON o.id = n.id '
+    'WHERE n.name IS DISTINCT FROM o.name); '
+    'RETURN NULL; END $$',
+    'CREATE TRIGGER food_ingredients_search '
+    'AFTER UPDATE ON food_ingredients '
+    'REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows '
+    'FOR EACH STATEMENT EXECUTE PROCEDURE food_ingredients_search()',
+    'UPDATE food_recipe SET search_document = '
+    'food_recipe_search_document(id, name, text)',
+    'CREATE INDEX food_recipe_search_document '
+    'ON food_recipe USING gin (search_document)',
+)
+POSTGRESQL_BACKWARD = (
+    'DROP TRIGGER IF EXISTS food_ingredients_search ON food_ingredients',
+    'DROP TRIGGER IF EXISTS food_recipeingredients_search_delete '
+    'ON food_recipeingredients',
+    'DROP TRIGGER IF EXISTS food_recipeingredients_search_insert '
+    'ON food_recipeingredients',
+    'DROP TRIGGER IF EXISTS food_recipe_search ON food_recipe',
+    'DROP FUNCTION IF EXISTS food_ingredients_search()',
+    'DROP FUNCTION IF EXISTS food_recipeingredients_search()',
+    'DROP FUNCTION IF EXISTS food_recipe_search()',
+    'DROP FUNCTION IF EXISTS food_recipe_search_document(bigint, text, text)',
+    'ALTER TABLE food_recipe DROP COLUMN IF EXISTS search_document',
+) + tuple(
+    statement for statement in search.POSTGRESQL_FORWARD
+    if statement.startswith('CREATE INDEX')
+    and 'food_recipe_name_trgm' not in statement
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('food', '0007_recreate_recipe_search_triggers'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            search.run_statements({'postgresql': POSTGRESQL_FORWARD}),
+            search.run_statements({'postgresql': POSTGRESQL_BACKWARD}),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Exists, OuterRef, Prefetch, Value
 from django.contrib.auth import get_user_model
 from django.core.validators import MinValueValidator, MaxValueValidator
 
@@ -12,7 +13,8 @@ from food.constants import (
     MAX_AMOUNT_VALUE,
     MIN_AMOUNT_VALUE
 )
-from food.services import generate_short_url
+from food.services import encode_short_url
+from users.models import Subscribe
 
 User = get_user_model()
 
@@ -62,6 +64,45 @@ class Tag(models.Model):
         return self.name
 
 
+class RecipeQuerySet(models.QuerySet):
+
+    def with_related(self):
+        """Автор, теги и ингредиенты рецепта за постоянное число запросов."""
+        return self.select_related('author').prefetch_related(
+            'tags',
+            Prefetch(
+                'recipe_ingredients',
+                queryset=RecipeIngredients.objects.select_related(
+                    'ingredients'
+                )
+            )
+        )
+
+    def with_user_flags(self, user):
+        """Флаги избранного, списка покупок и подписки на автора."""
+        if not user.is_authenticated:
+            return self.annotate(
+                is_favorited=Value(False, output_field=models.BooleanField()),
+                is_in_shopping_cart=Value(
+                    False, output_field=models.BooleanField()
+                ),
+                is_subscribed_to_author=Value(
+                    False, output_field=models.BooleanField()
+                ),
+            )
+        return self.annotate(
+            is_favorited=Exists(
+                Favourites.objects.filter(recipe=OuterRef('pk'), user=user)
+            ),
+            is_in_shopping_cart=Exists(
+                ShoppingCart.objects.filter(recipe=OuterRef('pk'), user=user)
+            ),
+            is_subscribed_to_author=Exists(
+                Subscribe.objects.filter(author=OuterRef('author'), user=user)
+            ),
+        )
+
+
 class Recipe(models.Model):
     author = models.ForeignKey(
         User,
@@ -101,22 +142,41 @@ class Recipe(models.Model):
         auto_now_add=True
     )
     short_url = models.CharField(
+        verbose_name='Старая короткая ссылка',
         max_length=TOKEN_LENGTH,
         unique=True,
-        blank=True
+        blank=True,
+        null=True
     )
+    favorites_count = models.PositiveIntegerField(
+        verbose_name='Количество в избранном',
+        default=0
+    )
+
+    objects = RecipeQuerySet.as_manager()
 
     class Meta:
         ordering = ('-pub_date',)
         verbose_name = 'Рецепт'
         verbose_name_plural = 'Рецепты'
+        indexes = (
+            models.Index(
+                fields=('-pub_date', '-id'),
+                name='recipe_pub_date_idx'
+            ),
+            models.Index(
+                fields=('author', '-pub_date'),
+                name='recipe_author_pub_date_idx'
+            ),
+        )
 
     def __str__(self):
         return f'{self.name} ({self.author})'
 
-    def save(self, *args, **kwargs):
-        generate_short_url(self)
-        super().save(*args, **kwargs)
+    @property
+    def short_link(self):
+        """Код короткой ссылки, вычисляемый по первичному ключу."""
+        return encode_short_url(self.pk)
 
 
 class RecipeIngredients(models.Model):
@@ -191,3 +251,36 @@ class ShoppingCart(UserRecipeAbstrakt):
     class Meta(UserRecipeAbstrakt.Meta):
         verbose_name = 'Список покупок'
         verbose_name_plural = 'Списки покупок'
+
+
+class ShoppingListItem(models.Model):
+    """Сумма ингредиента в списке покупок пользователя."""
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='shopping_list',
+        verbose_name='Пользователь'
+    )
+    ingredients = models.ForeignKey(
+        Ingredients,
+        on_delete=models.CASCADE,
+        related_name='shopping_list_items',
+        verbose_name='Ингредиент'
+    )
+    amount = models.IntegerField(
+        verbose_name='Количество'
+    )
+
+    class Meta:
+        verbose_name = 'Позиция списка покупок'
+        verbose_name_plural = 'Позиции списка покупок'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('user', 'ingredients'),
+                name='unique_shopping_list_item'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.user} - {self.ingredients}: {self.amount}'
@@ -0,0 +1,84 @@
+from django.db import connections
+
+RECIPE_INGREDIENT_NAMES = (
+    "SELECT group_concat(i.name, ' ') FROM food_recipeingredients ri "
+    'JOIN food_ingredients i ON i.id = ri.ingredients_id '
+    'WHERE ri.recipe_id = {recipe_id}'
+)
+SQLITE_SEARCH_TABLE = 'food_recipe_search'
+SQLITE_SEARCH_TRIGGERS = {
+    'food_recipe_search_insert': (
+        'AFTER INSERT ON food_recipe '
+        'BEGIN INSERT INTO food_recipe_search(rowid, name, text, ingredients) '
+        "VALUES (new.id, new.name, new.text, ''); END"
+    ),
+    'food_recipe_search_update': (
+        'AFTER UPDATE OF name, text ON food_recipe '
+        'BEGIN UPDATE food_recipe_search '
+        'SET name = new.name, text = new.text WHERE rowid = new.id; END'
+    ),
+    'food_recipe_search_delete': (
+        'AFTER DELETE ON food_recipe '
+        'BEGIN DELETE FROM food_recipe_search WHERE rowid = old.id; END'
+    ),
+    'food_recipeingredients_search_insert': (
+        'AFTER INSERT ON food_recipeingredients '
+        'BEGIN UPDATE food_recipe_search SET ingredients = ({}) '
+        'WHERE rowid = new.recipe_id; END'.format(
+            RECIPE_INGREDIENT_NAMES.format(recipe_id='new.recipe_id')
+        )
+    ),
+    'food_recipeingredients_search_delete': (
+        'AFTER DELETE ON food_recipeingredients '
+        'BEGIN UPDATE food_recipe_search SET ingredients = ({}) '
+        'WHERE rowid = old.recipe_id; END'.format(
+            RECIPE_INGREDIENT_NAMES.format(recipe_id='old.recipe_id')
+        )
+    ),
+    'food_ingredients_search_update': (
+        'AFTER UPDATE OF name ON food_ingredients '
+        'BEGIN UPDATE food_recipe_search SET ingredients = ({}) '
+        'WHERE rowid IN (SELECT recipe_id FROM food_recipeingredients '
+        'WHERE ingredients_id = new.id); END'.format(
+            RECIPE_INGREDIENT_NAMES.format(
+                recipe_id='food_recipe_search.rowid'
+            )
+        )
+    ),
+}
+SQLITE_SEARCH_FILL = (
+    'DELETE FROM food_recipe_search',
+    'INSERT INTO food_recipe_search(rowid, name, text, ingredients) '
+    "SELECT r.id, r.name, r.text, COALESCE(({}), '') "
+    'FROM food_recipe r'.format(
+        RECIPE_INGREDIENT_NAMES.format(recipe_id='r.id')
+    ),
+)
+
+
+def restore_sqlite_search(using, **kwargs):
+    """Возврат триггеров поиска рецептов после миграций в SQLite.
+
+    SQLite пересоздает таблицу при изменении ее полей и теряет триггеры.
+    Недостающие триггеры создаются заново, а индекс заполняется по
+    текущим данным.
+    """
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        if SQLITE_SEARCH_TABLE not in connection.introspection.table_names(
+            cursor
+        ):
+            return
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+        existing = {name for name, in cursor.fetchall()}
+        missing = SQLITE_SEARCH_TRIGGERS.keys() - existing
+        if not missing:
+            return
+        for name in missing:
+            cursor.execute(
+                f'CREATE TRIGGER {name} {SQLITE_SEARCH_TRIGGERS[name]}'
+            )
+        for statement in SQLITE_SEARCH_FILL:
+            cursor.execute(statement)
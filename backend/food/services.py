@@ -1,22 +1,120 @@
-import random
+from collections import OrderedDict
+from threading import Lock
+
+from django.db import connection
 
 from food.constants import (
     CHARACTERS,
-    TOKEN_LENGTH,
+    SHORT_LINK_CACHE_SIZE,
+    SHORT_URL_LENGTH,
+    SHORT_URL_MULTIPLIER,
+    SHORT_URL_OFFSET,
 )
 
+SHORT_URL_MODULUS = len(CHARACTERS) ** SHORT_URL_LENGTH
+SHORT_URL_INVERSE = pow(SHORT_URL_MULTIPLIER, -1, SHORT_URL_MODULUS)
+CHARACTER_INDEX = {char: index for index, char in enumerate(CHARACTERS)}
+
+
+def encode_short_url(pk):
+    """Короткая ссылка из первичного ключа.
+
+    Ключ перемешивается взаимно однозначным аффинным преобразованием по
+    модулю 62^7 и записывается в base62, поэтому разные рецепты всегда
+    получают разные коды без запросов к базе.
+    """
+    value = (pk * SHORT_URL_MULTIPLIER + SHORT_URL_OFFSET) % SHORT_URL_MODULUS
+    chars = []
+    for _ in range(SHORT_URL_LENGTH):
+        value, index = divmod(value, len(CHARACTERS))
+        chars.append(CHARACTERS[index])
+    return ''.join(reversed(chars))
+
+
+def decode_short_url(code):
+    """Первичный ключ по короткой ссылке или None для чужого формата."""
+    if len(code) != SHORT_URL_LENGTH:
+        return None
+    value = 0
+    for char in code:
+        if char not in CHARACTER_INDEX:
+            return None
+        value = value * len(CHARACTERS) + CHARACTER_INDEX[char]
+    return (
+        (value - SHORT_URL_OFFSET) * SHORT_URL_INVERSE % SHORT_URL_MODULUS
+    )
+
+
+class ShortLinkCache:
+    """LRU кеш соответствия коротких ссылок и идентификаторов рецептов.
+
+    Обратный словарь id -> ссылки позволяет удалить ссылки рецепта без
+    обхода всего кеша.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.items = OrderedDict()
+        self.slugs = {}
+        self.lock = Lock()
+        self.warmed = False
+
+    def _add(self, slug, pk):
+        old = self.items.get(slug)
+        if old is not None and old != pk:
+            self._remove(slug)
+        self.items[slug] = pk
+        self.slugs.setdefault(pk, set()).add(slug)
+
+    def _remove(self, slug):
+        pk = self.items.pop(slug)
+        slugs = self.slugs[pk]
+        slugs.discard(slug)
+        if not slugs:
+            del self.slugs[pk]
+
+    def get(self, slug):
+        with self.lock:
+            pk = self.items.get(slug)
+            if pk is not None:
+                self.items.move_to_end(slug)
+            return pk
+
+    def set(self, slug, pk):
+        with self.lock:
+            self._add(slug, pk)
+            self.items.move_to_end(slug)
+            if len(self.items) > self.maxsize:
+                self._remove(next(iter(self.items)))
+
+    def warm(self, pairs):
+        """Заполнение кеша парами (ссылка, id) до его предельного размера."""
+        with self.lock:
+            for slug, pk in pairs:
+                if len(self.items) >= self.maxsize:
+                    break
+                if slug not in self.items:
+                    self._add(slug, pk)
+            self.warmed = True
+
+    def discard(self, pk):
+        with self.lock:
+            for slug in self.slugs.pop(pk, ()):
+                del self.items[slug]
+
+
+short_link_cache = ShortLinkCache(SHORT_LINK_CACHE_SIZE)
+
 
-def generate_short_url(self):
-    """Генерация коротной ссылки."""
-    if not self.short_url:
-        while True:
-            self.short_url = ''.join(
-                random.choices(
-                    CHARACTERS,
-                    k=TOKEN_LENGTH
-                )
-            )
-            if not self.__class__.objects.filter(
-                short_url=self.short_url
-            ).exists():
-                break
+def bulk_create_with_pks(model, objs):
+    """bulk_create с заполненными первичными ключами, внутри транзакции."""
+    model.objects.bulk_create(objs)
+    if not connection.features.can_return_rows_from_bulk_insert:
+        # SQLite держит блокировку записи до конца транзакции, поэтому
+        # пакет занимает последние идентификаторы подряд.
+        pks = list(model.objects.order_by('-pk').values_list(
+            'pk', flat=True
+        )[:len(objs)])
+        for obj, pk in zip(objs, reversed(pks)):
+            obj.pk = pk
+    return objs
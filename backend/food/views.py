@@ -1,14 +1,37 @@
-from django.http import HttpResponseRedirect
-from django.shortcuts import get_object_or_404
-from rest_framework.decorators import api_view
+from django.http import Http404, HttpResponseRedirect
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import require_safe
 
+from food.constants import SHORT_LINK_CACHE_SIZE, SHORT_LINK_MAX_AGE
 from food.models import Recipe
+from food.services import decode_short_url, short_link_cache
 
 
-@api_view(('GET',))
+def get_recipe_id(slug):
+    """Идентификатор рецепта по короткой ссылке через LRU кеш."""
+    if not short_link_cache.warmed:
+        short_link_cache.warm(
+            Recipe.objects.filter(short_url__isnull=False).values_list(
+                'short_url', 'id'
+            )[:SHORT_LINK_CACHE_SIZE].iterator()
+        )
+    pk = short_link_cache.get(slug)
+    if pk is not None:
+        return pk
+    pk = decode_short_url(slug)
+    lookup = {'short_url': slug} if pk is None else {'pk': pk}
+    pk = Recipe.objects.filter(**lookup).values_list('id', flat=True).first()
+    if pk is None:
+        raise Http404
+    short_link_cache.set(slug, pk)
+    return pk
+
+
+@require_safe
 def redirect_link(request, slug):
     """Возвращает рецепт по его коротной ссылке."""
-    recipe = get_object_or_404(Recipe, short_url=slug)
-    return HttpResponseRedirect(
-        request.build_absolute_uri(f'/recipes/{recipe.id}/')
+    response = HttpResponseRedirect(
+        request.build_absolute_uri(f'/recipes/{get_recipe_id(slug)}/')
     )
+    patch_cache_control(response, private=True, max_age=SHORT_LINK_MAX_AGE)
+    return response
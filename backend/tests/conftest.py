@@ -0,0 +1,115 @@
+import pytest
+from django.core.cache import caches
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from food.models import Ingredients, Recipe, RecipeIngredients, Tag
+from users.models import User
+
+RECIPE_IMAGE = 'recipes/images/recipe.png'
+
+
+@pytest.fixture(autouse=True)
+def test_settings(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    for cache in caches.all():
+        cache.clear()
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(
+        username='user',
+        email='user@foodgram.ru',
+        first_name='Иван',
+        last_name='Иванов',
+        password='password'
+    )
+
+
+@pytest.fixture
+def author(db):
+    return User.objects.create_user(
+        username='author',
+        email='author@foodgram.ru',
+        first_name='Пётр',
+        last_name='Петров',
+        password='password'
+    )
+
+
+def get_client(user):
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=user).key}'
+    )
+    return client
+
+
+@pytest.fixture
+def user_client(user):
+    return get_client(user)
+
+
+@pytest.fixture
+def author_client(author):
+    return get_client(author)
+
+
+@pytest.fixture
+def admin_client(client, db):
+    client.force_login(User.objects.create_superuser(
+        username='admin', email='admin@foodgram.ru', password='password'
+    ))
+    return client
+
+
+@pytest.fixture
+def tags(db):
+    Tag.objects.bulk_create(
+        Tag(name=f'Тег {number}', slug=f'tag{number}')
+        for number in range(3)
+    )
+    return list(Tag.objects.all())
+
+
+@pytest.fixture
+def ingredients(db):
+    Ingredients.objects.bulk_create(
+        Ingredients(name=f'Ингредиент {number}', measurement_unit='г')
+        for number in range(30)
+    )
+    return list(Ingredients.objects.all())
+
+
+@pytest.fixture
+def create_recipes(author, tags, ingredients):
+    """Фабрика рецептов автора с тегами и ингредиентами."""
+    def create(count, ingredients_count=3):
+        recipes = []
+        for number in range(count):
+            recipe = Recipe.objects.create(
+                author=author,
+                name=f'Рецепт {number}',
+                text='Описание',
+                image=RECIPE_IMAGE,
+                cooking_time=number + 1
+            )
+            recipe.tags.set(tags[:number % len(tags) + 1])
+            RecipeIngredients.objects.bulk_create(
+                RecipeIngredients(
+                    recipe=recipe,
+                    ingredients=ingredient,
+                    amount=amount + 1
+                )
+                for amount, ingredient in enumerate(
+                    ingredients[:ingredients_count]
+                )
+            )
+            recipes.append(recipe)
+        return recipes
+    return create
@@ -0,0 +1,12 @@
+from foodgram_backend.settings import *  # noqa: F401, F403
+
+SECRET_KEY = 'foodgram-tests'
+DEBUG = False
+METRICS_SAMPLE_RATE = 0
+CACHES = {
+    name: {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': f'foodgram-{name}',
+    }
+    for name in ('default', 'responses')
+}
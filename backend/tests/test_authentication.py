@@ -0,0 +1,49 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db.models import F
+from PIL import Image
+
+from users.models import User
+
+
+@pytest.fixture
+def avatar():
+    buffer = BytesIO()
+    Image.new('RGB', (16, 16), 'red').save(buffer, 'PNG')
+    return SimpleUploadedFile(
+        'avatar.png', buffer.getvalue(), content_type='image/png'
+    )
+
+
+def increment_recipes_count(user):
+    User.objects.filter(pk=user.pk).update(
+        recipes_count=F('recipes_count') + 1
+    )
+
+
+def test_cached_user_does_not_overwrite_counters(user, user_client, avatar):
+    assert user_client.get('/api/users/me/').status_code == 200
+    increment_recipes_count(user)
+    response = user_client.put(
+        '/api/users/me/avatar/', {'avatar': avatar}, format='multipart'
+    )
+    assert response.status_code == 200
+    assert user_client.delete('/api/users/me/avatar/').status_code == 204
+    user.refresh_from_db()
+    assert user.recipes_count == 1
+
+
+def test_cached_user_password_change_keeps_counters(user, user_client):
+    assert user_client.get('/api/users/me/').status_code == 200
+    increment_recipes_count(user)
+    response = user_client.post(
+        '/api/users/set_password/',
+        {'current_password': 'password', 'new_password': 'Xq83!kdlq'},
+        format='json'
+    )
+    assert response.status_code == 204
+    user.refresh_from_db()
+    assert user.recipes_count == 1
+    assert user.check_password('Xq83!kdlq')
@@ -0,0 +1,60 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+from food.models import Favourites, Recipe
+from users.models import Subscribe, User
+
+
+def check_counters():
+    out = StringIO()
+    call_command('rebuild_counters', '--check', stdout=out)
+    return out.getvalue()
+
+
+def test_api_writes_update_counters(user_client, author, create_recipes):
+    recipe = create_recipes(1)[0]
+    assert user_client.post(
+        f'/api/recipes/{recipe.id}/favorite/'
+    ).status_code == 201
+    assert user_client.post(
+        f'/api/users/{author.id}/subscribe/'
+    ).status_code == 201
+    recipe.refresh_from_db()
+    author.refresh_from_db()
+    assert recipe.favorites_count == 1
+    assert author.subscribers_count == 1
+    assert author.recipes_count == 1
+    user_client.delete(f'/api/recipes/{recipe.id}/favorite/')
+    user_client.delete(f'/api/users/{author.id}/subscribe/')
+    recipe.refresh_from_db()
+    author.refresh_from_db()
+    assert recipe.favorites_count == 0
+    assert author.subscribers_count == 0
+
+
+def test_cascade_deletes_keep_counters(user, author, create_recipes):
+    recipes = create_recipes(3)
+    fan = User.objects.create_user(
+        username='fan', email='fan@foodgram.ru', password='password'
+    )
+    for follower in (user, fan):
+        Subscribe.objects.create(user=follower, author=author)
+        for recipe in recipes:
+            Favourites.objects.create(user=follower, recipe=recipe)
+    Recipe.objects.create(
+        author=user,
+        name='Рецепт пользователя',
+        text='Описание',
+        image='recipes/images/recipe.png',
+        cooking_time=1
+    )
+    user.delete()
+    recipes[0].delete()
+    assert 'неверно' not in check_counters()
+    author.refresh_from_db()
+    assert author.recipes_count == 2
+    assert author.subscribers_count == 1
+    assert set(
+        Recipe.objects.values_list('favorites_count', flat=True)
+    ) == {1}
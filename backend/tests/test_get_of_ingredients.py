@@ -0,0 +1,44 @@
+import pytest
+from django.core.management import call_command
+
+from food.models import Ingredients
+
+
+@pytest.fixture
+def load(db, tmp_path):
+    def load(rows, **options):
+        path = tmp_path / 'ingredients.csv'
+        path.write_text(
+            ''.join(f'{name},{unit}\n' for name, unit in rows),
+            encoding='utf-8'
+        )
+        call_command('get_of_ingredients', path=str(path), **options)
+        return set(
+            Ingredients.objects.values_list('name', 'measurement_unit')
+        )
+    return load
+
+
+def test_same_name_with_another_unit_is_added(load):
+    load((('соль', 'г'), ('сахар', 'г')))
+    assert load((('соль', 'по вкусу'), ('соль', 'г'), ('сахар', 'кг'))) == {
+        ('соль', 'г'),
+        ('соль', 'по вкусу'),
+        ('сахар', 'г'),
+        ('сахар', 'кг'),
+    }
+
+
+def test_update_units_changes_only_unambiguous_names(load):
+    load((('соль', 'г'), ('сахар', 'г'), ('мука', 'г'), ('мука', 'кг')))
+    assert load(
+        (('соль', 'г'), ('соль', 'по вкусу'), ('сахар', 'кг'), ('мука', 'ст')),
+        update_units=True
+    ) == {
+        ('соль', 'г'),
+        ('соль', 'по вкусу'),
+        ('сахар', 'кг'),
+        ('мука', 'г'),
+        ('мука', 'кг'),
+        ('мука', 'ст'),
+    }
@@ -0,0 +1,61 @@
+import re
+
+import pytest
+from django.db import connection
+
+from food.models import Favourites, Recipe
+
+pytestmark = pytest.mark.skipif(
+    connection.vendor not in ('sqlite', 'postgresql'),
+    reason='Планы запросов проверяются только для SQLite и Postgres'
+)
+
+FAVOURITES_INDEX = {
+    'sqlite': 'sqlite_autoindex_food_favourites_1',
+    'postgresql': 'unique_favourites',
+}
+RECIPE_QUERIES = {
+    'feed': (lambda user, author: {}, ('recipe_pub_date_idx',)),
+    'author': (
+        lambda user, author: {'author': author},
+        ('recipe_author_pub_date_idx',)
+    ),
+    'tag': (
+        lambda user, author: {'tags__slug__in': ('tag1',)},
+        ('recipe_tags_tag_recipe_idx',)
+    ),
+    'favourites': (
+        lambda user, author: {'is_favorited': True},
+        (FAVOURITES_INDEX[connection.vendor],)
+    ),
+}
+SQLITE_FULL_SCAN = re.compile(r'\bSCAN \w+(?! USING)(\s|$)')
+
+
+def get_plan(queryset):
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+    return queryset.explain()
+
+
+@pytest.mark.parametrize('query', RECIPE_QUERIES)
+def test_recipe_list_queries_use_indexes(
+    query, user, author, create_recipes
+):
+    recipes = create_recipes(30)
+    Favourites.objects.bulk_create(
+        Favourites(user=user, recipe=recipe) for recipe in recipes[::3]
+    )
+    get_filters, indexes = RECIPE_QUERIES[query]
+    plan = get_plan(
+        Recipe.objects.with_user_flags(user).filter(
+            **get_filters(user, author)
+        )
+    )
+    for index in indexes:
+        assert index in plan
+    if connection.vendor == 'sqlite':
+        assert not SQLITE_FULL_SCAN.search(plan), plan
+    else:
+        assert 'Seq Scan' not in plan, plan
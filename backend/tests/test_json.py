@@ -0,0 +1,83 @@
+from io import BytesIO
+
+import pytest
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api import parsers, renderers
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer
+from users.models import Subscribe
+
+URLS = (
+    '/api/users/',
+    '/api/users/{author}/',
+    '/api/users/me/',
+    '/api/users/subscriptions/?recipes_limit=1',
+    '/api/tags/',
+    '/api/tags/{tag}/',
+    '/api/ingredients/',
+    '/api/ingredients/{ingredient}/',
+    '/api/ingredients/?name=ингр',
+    '/api/recipes/',
+    '/api/recipes/?limit=50',
+    '/api/recipes/{recipe}/',
+    '/api/recipes/{recipe}/get-link/',
+    '/api/recipes/0/',
+)
+
+
+@pytest.fixture
+def recipes(user, author, create_recipes):
+    recipes = create_recipes(3)
+    recipes[0].text = 'строки\u2028абзацы\u2029 "кавычки" \\ \x01 \x7f ё 😀'
+    recipes[0].save()
+    Subscribe.objects.create(user=user, author=author)
+    return recipes
+
+
+@pytest.fixture(params=(True, False), ids=('orjson', 'json'))
+def orjson_installed(request, monkeypatch):
+    if not request.param:
+        monkeypatch.setattr(renderers, 'orjson', None)
+        monkeypatch.setattr(parsers, 'orjson', None)
+
+
+@pytest.mark.parametrize('authenticated', (True, False))
+@pytest.mark.parametrize('url', URLS)
+def test_fast_json_matches_drf_json(
+    url, authenticated, client, user_client, recipes, tags, ingredients,
+    orjson_installed
+):
+    client = user_client if authenticated else client
+    response = client.get(url.format(
+        author=recipes[0].author_id,
+        tag=tags[0].id,
+        ingredient=ingredients[0].id,
+        recipe=recipes[0].id
+    ))
+    expected = JSONRenderer().render(response.data)
+    assert response.content == expected
+    assert FastJSONRenderer().render(response.data) == expected
+    assert FastJSONParser().parse(BytesIO(expected)) == JSONParser().parse(
+        BytesIO(expected)
+    )
+
+
+@pytest.mark.parametrize('body', (b'{bad', b'{"name": NaN}', b'[1, 2'))
+def test_invalid_json_is_bad_request(user_client, body, orjson_installed):
+    response = user_client.post(
+        '/api/recipes/', data=body, content_type='application/json'
+    )
+    assert response.status_code == 400
+
+
+def test_indent_falls_back_to_drf_json(user_client, recipes):
+    response = user_client.get(
+        f'/api/recipes/{recipes[0].id}/',
+        HTTP_ACCEPT='application/json; indent=2'
+    )
+    assert response.content == JSONRenderer().render(
+        response.data, 'application/json; indent=2'
+    )
+    assert response.content.startswith(b'{\n  "id"')
@@ -0,0 +1,91 @@
+import pytest
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api.pagination import RecipesCursorPagination
+from food.models import Recipe
+
+RECIPES_URL = '/api/recipes/'
+
+
+@pytest.fixture
+def recipes(create_recipes):
+    recipes = create_recipes(7)
+    Recipe.objects.update(pub_date=timezone.now())
+    return recipes
+
+
+def get_ids(response):
+    assert response.status_code == 200
+    return [recipe['id'] for recipe in response.json()['results']]
+
+
+def test_cursor_pages_cover_recipes_with_same_pub_date(recipes):
+    client = APIClient()
+    ids = []
+    url = f'{RECIPES_URL}?cursor=&limit=2'
+    while url:
+        response = client.get(url)
+        ids += get_ids(response)
+        url = response.json()['next']
+    assert ids == sorted((recipe.id for recipe in recipes), reverse=True)
+
+
+def test_cursor_previous_returns_previous_page(recipes):
+    client = APIClient()
+    first = client.get(f'{RECIPES_URL}?cursor=&limit=3')
+    assert first.json()['previous'] is None
+    second = client.get(first.json()['next'])
+    assert get_ids(client.get(second.json()['previous'])) == get_ids(first)
+
+
+def test_cursor_count(recipes):
+    response = APIClient().get(f'{RECIPES_URL}?cursor=&limit=2')
+    assert response.json()['count'] == len(recipes)
+
+
+@pytest.mark.parametrize('cursor', ['bad', 'MHxub3RhZGF0ZXwx', 'MHwx'])
+def test_invalid_cursor(db, cursor):
+    response = APIClient().get(f'{RECIPES_URL}?cursor={cursor}')
+    assert response.status_code == 404
+
+
+def test_cursor_page_size_is_capped(monkeypatch, recipes):
+    monkeypatch.setattr(RecipesCursorPagination, 'max_page_size', 3)
+    response = APIClient().get(f'{RECIPES_URL}?cursor=&limit=1000000')
+    assert len(get_ids(response)) == 3
+
+
+def get_count(client, url):
+    response = client.get(url)
+    assert response.status_code == 200
+    return response.json()['count']
+
+
+def test_favorited_count_follows_favourites(user_client, recipes):
+    url = f'{RECIPES_URL}?is_favorited=1'
+    assert get_count(user_client, url) == 0
+    user_client.post(f'{RECIPES_URL}{recipes[0].id}/favorite/')
+    assert get_count(user_client, url) == 1
+    user_client.delete(f'{RECIPES_URL}{recipes[0].id}/favorite/')
+    assert get_count(user_client, url) == 0
+
+
+def test_author_count_follows_recipes(
+    user_client, author, recipes, create_recipes
+):
+    url = f'{RECIPES_URL}?author={author.id}'
+    assert get_count(user_client, url) == len(recipes)
+    create_recipes(1)
+    assert get_count(user_client, url) == len(recipes) + 1
+    recipes[0].delete()
+    assert get_count(user_client, url) == len(recipes)
+
+
+def test_subscriptions_count_follows_subscriptions(user_client, author):
+    url = '/api/users/subscriptions/'
+    assert get_count(user_client, url) == 0
+    user_client.post(f'/api/users/{author.id}/subscribe/')
+    assert get_count(user_client, url) == 1
+    user_client.delete(f'/api/users/{author.id}/subscribe/')
+    assert get_count(user_client, url) == 0
@@ -0,0 +1,31 @@
+import pytest
+
+from food.models import Favourites, ShoppingCart
+from users.models import Subscribe
+
+RECIPE_LIST_MAX_QUERIES = 5
+
+
+@pytest.mark.parametrize('fast_serializer', (True, False))
+@pytest.mark.parametrize('ingredients_count', (3, 25))
+@pytest.mark.parametrize('limit', (6, 50))
+def test_recipe_list_queries_do_not_depend_on_page_size(
+    limit, ingredients_count, fast_serializer, settings, user, author,
+    user_client, create_recipes, django_assert_max_num_queries
+):
+    settings.FAST_RECIPE_SERIALIZER = fast_serializer
+    recipes = create_recipes(limit, ingredients_count)
+    Favourites.objects.create(user=user, recipe=recipes[0])
+    ShoppingCart.objects.create(user=user, recipe=recipes[1])
+    Subscribe.objects.create(user=user, author=author)
+    with django_assert_max_num_queries(RECIPE_LIST_MAX_QUERIES):
+        response = user_client.get(f'/api/recipes/?limit={limit}')
+    assert response.status_code == 200
+    results = response.json()['results']
+    assert len(results) == limit
+    assert all(
+        len(recipe['ingredients']) == ingredients_count for recipe in results
+    )
+    assert sum(recipe['is_favorited'] for recipe in results) == 1
+    assert sum(recipe['is_in_shopping_cart'] for recipe in results) == 1
+    assert all(recipe['author']['is_subscribed'] for recipe in results)
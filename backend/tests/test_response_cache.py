@@ -0,0 +1,73 @@
+import pytest
+from rest_framework.test import APIClient
+
+RECIPES_URL = '/api/recipes/'
+
+
+@pytest.fixture
+def recipe(create_recipes):
+    return create_recipes(1)[0]
+
+
+@pytest.fixture
+def client():
+    return APIClient()
+
+
+def get_recipe(client, recipe, **extra):
+    response = client.get(f'{RECIPES_URL}{recipe.id}/', **extra)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_anonymous_response_is_cached(
+    client, recipe, django_assert_num_queries
+):
+    first = client.get(RECIPES_URL).json()
+    with django_assert_num_queries(0):
+        assert client.get(RECIPES_URL).json() == first
+    get_recipe(client, recipe)
+    with django_assert_num_queries(0):
+        get_recipe(client, recipe)
+
+
+def test_recipe_update_resets_cache(client, recipe):
+    get_recipe(client, recipe)
+    client.get(RECIPES_URL)
+    recipe.name = 'Новое название'
+    recipe.save()
+    assert get_recipe(client, recipe)['name'] == 'Новое название'
+    assert client.get(RECIPES_URL).json()['results'][0]['name'] == (
+        'Новое название'
+    )
+
+
+def test_recipe_delete_resets_cache(client, recipe):
+    get_recipe(client, recipe)
+    assert client.get(RECIPES_URL).json()['count'] == 1
+    recipe.delete()
+    assert client.get(f'{RECIPES_URL}{recipe.id}/').status_code == 404
+    assert client.get(RECIPES_URL).json()['count'] == 0
+
+
+def test_recipe_tags_change_resets_cache(client, recipe, tags):
+    get_recipe(client, recipe)
+    recipe.tags.set(tags)
+    assert [tag['id'] for tag in get_recipe(client, recipe)['tags']] == [
+        tag.id for tag in tags
+    ]
+
+
+def test_author_change_resets_cache(client, recipe, author):
+    get_recipe(client, recipe)
+    author.first_name = 'Новое имя'
+    author.save()
+    assert get_recipe(client, recipe)['author']['first_name'] == 'Новое имя'
+
+
+def test_cache_is_separated_by_host(settings, client, recipe):
+    settings.ALLOWED_HOSTS = ['testserver', 'other.host']
+    assert get_recipe(client, recipe)['image'].startswith('http://testserver/')
+    assert get_recipe(client, recipe, HTTP_HOST='other.host')[
+        'image'
+    ].startswith('http://other.host/')
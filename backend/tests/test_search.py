@@ -0,0 +1,53 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from food.models import Ingredients, RecipeIngredients
+
+SEARCH_URL = '/api/recipes/?search={}'
+
+
+@pytest.fixture
+def recipes(create_recipes, ingredients):
+    recipes = create_recipes(2, ingredients_count=0)
+    recipes[0].name = 'Борщ'
+    recipes[0].save()
+    RecipeIngredients.objects.create(
+        recipe=recipes[1],
+        ingredients=Ingredients.objects.create(
+            name='Свекла', measurement_unit='г'
+        ),
+        amount=1
+    )
+    return recipes
+
+
+def search(client, query):
+    response = client.get(SEARCH_URL.format(query))
+    assert response.status_code == 200
+    return [recipe['id'] for recipe in response.json()['results']]
+
+
+def test_search_by_name(user_client, recipes):
+    assert search(user_client, 'борщ') == [recipes[0].id]
+
+
+def test_search_by_ingredient(user_client, recipes):
+    assert search(user_client, 'свек') == [recipes[1].id]
+
+
+@pytest.mark.skipif(
+    connection.vendor != 'sqlite', reason='Триггеры FTS5 есть только в SQLite'
+)
+def test_migrate_restores_sqlite_search_triggers(
+    user_client, recipes, create_recipes
+):
+    with connection.cursor() as cursor:
+        cursor.execute('DROP TRIGGER food_recipe_search_insert')
+        cursor.execute('DROP TRIGGER food_recipeingredients_search_insert')
+    call_command('migrate', verbosity=0)
+    recipe, = create_recipes(1, ingredients_count=0)
+    recipe.name = 'Окрошка'
+    recipe.save()
+    assert search(user_client, 'окрошка') == [recipe.id]
+    assert search(user_client, 'свек') == [recipes[1].id]
@@ -0,0 +1,43 @@
+import pytest
+from django.core.cache import caches
+
+from food.models import Favourites, ShoppingCart
+from users.models import Subscribe
+
+URLS = (
+    '/api/recipes/',
+    '/api/recipes/?page=2',
+    '/api/recipes/?limit=50',
+    '/api/recipes/?is_favorited=1',
+    '/api/recipes/?tags=tag1',
+)
+
+
+@pytest.fixture
+def recipes(user, author, create_recipes):
+    recipes = create_recipes(10, ingredients_count=5)
+    Favourites.objects.create(user=user, recipe=recipes[0])
+    ShoppingCart.objects.create(user=user, recipe=recipes[1])
+    Subscribe.objects.create(user=user, author=author)
+    return recipes
+
+
+def render(settings, client, url, fast):
+    settings.FAST_RECIPE_SERIALIZER = fast
+    for cache in caches.all():
+        cache.clear()
+    response = client.get(url)
+    assert response.status_code == 200
+    return response.content
+
+
+@pytest.mark.parametrize('authenticated', (True, False))
+@pytest.mark.parametrize('url', URLS + ('/api/recipes/{id}/',))
+def test_fast_serializer_output_matches_regular(
+    url, authenticated, settings, client, user_client, recipes
+):
+    client = user_client if authenticated else client
+    url = url.format(id=recipes[0].id)
+    assert render(settings, client, url, fast=True) == render(
+        settings, client, url, fast=False
+    )
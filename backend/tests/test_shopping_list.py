@@ -0,0 +1,114 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+DOWNLOAD_URL = '/api/recipes/download_shopping_cart/'
+
+
+@pytest.fixture
+def cart(user_client, create_recipes):
+    recipes = create_recipes(2, ingredients_count=2)
+    for recipe in recipes:
+        response = user_client.post(f'/api/recipes/{recipe.id}/shopping_cart/')
+        assert response.status_code == 201
+    return recipes
+
+
+def test_download_txt(user_client, cart):
+    response = user_client.get(f'{DOWNLOAD_URL}?format=txt')
+    assert response.status_code == 200
+    assert b''.join(response.streaming_content).decode().splitlines() == [
+        'Список покупок:',
+        'Ингредиент 0: 2, г',
+        'Ингредиент 1: 4, г',
+    ]
+
+
+def test_download_csv(user_client, cart):
+    response = user_client.get(f'{DOWNLOAD_URL}?format=csv')
+    assert response.status_code == 200
+    assert response['Content-Type'] == 'text/csv; charset=utf-8'
+    assert b''.join(response.streaming_content).decode().splitlines() == [
+        'Ингредиент,Количество,Единица измерения',
+        'Ингредиент 0,2,г',
+        'Ингредиент 1,4,г',
+    ]
+
+
+def test_download_pdf(user_client, cart):
+    response = user_client.get(f'{DOWNLOAD_URL}?format=pdf')
+    assert response.status_code == 200
+    assert response['Content-Type'] == 'application/pdf'
+    content = b''.join(response.streaming_content)
+    assert content.startswith(b'%PDF')
+    assert content.rstrip().endswith(b'%%EOF')
+
+
+def test_remove_from_cart_updates_shopping_list(user, user_client, cart):
+    response = user_client.delete(f'/api/recipes/{cart[0].id}/shopping_cart/')
+    assert response.status_code == 204
+    assert dict(
+        user.shopping_list.values_list('ingredients__name', 'amount')
+    ) == {'Ингредиент 0': 1, 'Ингредиент 1': 2}
+
+
+def test_author_deletion_clears_shopping_list(user, author, cart):
+    assert user.shopping_list.exists()
+    author.delete()
+    assert not user.shopping_list.exists()
+
+
+def test_recipe_deletion_updates_shopping_list(user, author_client, cart):
+    response = author_client.delete(f'/api/recipes/{cart[1].id}/')
+    assert response.status_code == 204
+    assert dict(
+        user.shopping_list.values_list('ingredients__name', 'amount')
+    ) == {'Ингредиент 0': 1, 'Ингредиент 1': 2}
+
+
+def test_admin_recipe_edit_updates_shopping_list(user, admin_client, cart):
+    recipe = cart[0]
+    ingredients = list(recipe.recipe_ingredients.order_by('pk'))
+    data = {
+        'name': recipe.name,
+        'text': recipe.text,
+        'cooking_time': recipe.cooking_time,
+        'author': recipe.author_id,
+        'tags': [tag.pk for tag in recipe.tags.all()],
+        'recipe_ingredients-TOTAL_FORMS': len(ingredients),
+        'recipe_ingredients-INITIAL_FORMS': len(ingredients),
+        'recipe_ingredients-MIN_NUM_FORMS': 1,
+        'recipe_ingredients-MAX_NUM_FORMS': 1000,
+    }
+    for index, item in enumerate(ingredients):
+        prefix = f'recipe_ingredients-{index}'
+        data.update({
+            f'{prefix}-id': item.pk,
+            f'{prefix}-recipe': recipe.pk,
+            f'{prefix}-ingredients': item.ingredients_id,
+            f'{prefix}-amount': 5 if index == 0 else item.amount,
+            f'{prefix}-DELETE': 'on' if index == 1 else '',
+        })
+    response = admin_client.post(
+        f'/admin/food/recipe/{recipe.pk}/change/', data
+    )
+    assert response.status_code == 302
+    assert dict(
+        user.shopping_list.values_list('ingredients__name', 'amount')
+    ) == {'Ингредиент 0': 6, 'Ингредиент 1': 2}
+
+
+def test_rebuild_shopping_lists(user, cart):
+    out = StringIO()
+    call_command('rebuild_shopping_lists', '--check', stdout=out)
+    assert 'верно' in out.getvalue() and 'неверно' not in out.getvalue()
+    user.shopping_list.filter(ingredients__name='Ингредиент 0').delete()
+    user.shopping_list.update(amount=100)
+    out = StringIO()
+    call_command('rebuild_shopping_lists', '--check', stdout=out)
+    assert 'неверно у 1 пользователей' in out.getvalue()
+    call_command('rebuild_shopping_lists', stdout=StringIO())
+    assert dict(
+        user.shopping_list.values_list('ingredients__name', 'amount')
+    ) == {'Ингредиент 0': 2, 'Ингредиент 1': 4}
@@ -0,0 +1,29 @@
+from food.services import ShortLinkCache
+
+
+def test_short_link_redirects_to_recipe(client, user_client, create_recipes):
+    recipe, = create_recipes(1)
+    response = user_client.get(f'/api/recipes/{recipe.id}/get-link/')
+    assert response.status_code == 200
+    response = client.get(response.json()['short-link'])
+    assert response.status_code == 302
+    assert response['Location'].endswith(f'/recipes/{recipe.id}/')
+    assert response['Cache-Control'] == 'private, max-age=60'
+
+
+def test_deleted_recipe_short_link_is_not_found(client, create_recipes):
+    recipe, = create_recipes(1)
+    url = f'/s/{recipe.short_link}/'
+    assert client.get(url).status_code == 302
+    recipe.delete()
+    assert client.get(url).status_code == 404
+
+
+def test_short_link_cache_discard():
+    cache = ShortLinkCache(2)
+    cache.warm((('a', 1), ('b', 2)))
+    cache.set('c', 1)
+    assert (cache.get('a'), cache.get('b'), cache.get('c')) == (None, 2, 1)
+    cache.set('b', 1)
+    cache.discard(1)
+    assert cache.items == {} and cache.slugs == {}
@@ -0,0 +1,36 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+
+
+@pytest.fixture
+def image():
+    buffer = BytesIO()
+    Image.new('RGB', (64, 64), 'red').save(buffer, 'PNG')
+    return SimpleUploadedFile(
+        'avatar.png', buffer.getvalue(), content_type='image/png'
+    )
+
+
+def test_multipart_avatar_upload(user_client, image):
+    response = user_client.put(
+        '/api/users/me/avatar/', {'avatar': image}, format='multipart'
+    )
+    assert response.status_code == 200
+    assert response.json()['avatar']
+
+
+def test_api_upload_over_limit_is_rejected(settings, user_client, image):
+    settings.MAX_UPLOAD_SIZE = 100
+    response = user_client.put(
+        '/api/users/me/avatar/', {'avatar': image}, format='multipart'
+    )
+    assert response.status_code == 413
+
+
+def test_upload_limit_does_not_break_admin(settings, admin_client, image):
+    settings.MAX_UPLOAD_SIZE = 100
+    response = admin_client.post('/admin/food/recipe/add/', {'image': image})
+    assert response.status_code == 200
@@ -7,6 +7,7 @@ from users.models import Subscribe, User
 @admin.register(Subscribe)
 class SubscribeAdmin(admin.ModelAdmin):
     list_display = ('user', 'author')
+    list_select_related = ('user', 'author')
 
 
 @admin.register(User)
@@ -20,11 +21,3 @@ class UserAdmin(BaseUserAdmin):
         'subscribers_count',
     )
     search_fields = ('email', 'first_name')
-
-    @admin.display(description='Количество рецептов')
-    def recipes_count(self, obj):
-        return obj.recipes.count()
-
-    @admin.display(description='Количество подписчиков')
-    def subscribers_count(self, obj):
-        return obj.subscriptions_on_author.count()